@@ -0,0 +1,82 @@
+"""
+Benchmark: vectorized compare_frames vs the old per-cell iloc loop.
+
+    python benchmarks/bench_comparer.py [rows] [cols]
+
+Only the comparison itself is timed (no Excel I/O). The legacy loop is run
+on a smaller slice and extrapolated, because on 50k rows it takes minutes.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.comparer import compare_frames  # noqa: E402
+
+
+def legacy_compare(template_df, scraped_df, compare_columns):
+    status_list = []
+    status_msg_list = []
+    for i in range(len(template_df)):
+        if i >= len(scraped_df):
+            status_list.append("MISMATCH")
+            status_msg_list.append("Row missing in scraped file")
+            continue
+        diffs = []
+        for col in compare_columns:
+            val_ref = template_df.iloc[i][col]
+            val_scraped = scraped_df.iloc[i][col]
+            if pd.isna(val_ref) and pd.isna(val_scraped):
+                continue
+            if val_ref != val_scraped:
+                diffs.append(f"{col}: expected '{val_ref}', found '{val_scraped}'")
+        if diffs:
+            status_list.append("MISMATCH")
+            status_msg_list.append(", ".join(diffs))
+        else:
+            status_list.append("MATCH")
+            status_msg_list.append("OK")
+    return status_list, status_msg_list
+
+
+def make_frames(rows, cols, mismatch_rate=0.02, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {f"COL{c}": rng.integers(0, 10**6, rows).astype(str).astype(object) for c in range(cols)}
+    template_df = pd.DataFrame(data)
+    template_df.iloc[::17, 0] = np.nan
+    scraped_df = template_df.copy()
+    for c in range(cols):
+        mask = rng.random(rows) < mismatch_rate / cols * 5
+        scraped_df.loc[mask, f"COL{c}"] = "changed"
+    return template_df, scraped_df
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    template_df, scraped_df = make_frames(rows, cols)
+    columns = list(template_df.columns)
+
+    t0 = time.perf_counter()
+    status, msgs = compare_frames(template_df, scraped_df, columns)
+    t_new = time.perf_counter() - t0
+
+    sample = min(rows, 1_000)
+    t0 = time.perf_counter()
+    old_status, old_msgs = legacy_compare(template_df.iloc[:sample], scraped_df.iloc[:sample], columns)
+    t_old_sample = time.perf_counter() - t0
+    t_old = t_old_sample * rows / sample
+
+    assert (status[:sample], msgs[:sample]) == (old_status, old_msgs), "results differ from legacy loop"
+
+    print(f"{rows} rows x {cols} columns, {status.count('MISMATCH')} mismatching rows")
+    print(f"vectorized : {t_new:8.3f} s")
+    print(f"legacy loop: {t_old:8.3f} s (extrapolated from {sample} rows)")
+    print(f"speed-up   : {t_old / t_new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
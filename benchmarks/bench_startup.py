@@ -0,0 +1,86 @@
+"""
+Benchmark: cold start of the main window, in fresh interpreter processes.
+
+    python benchmarks/bench_startup.py [runs] [--max-seconds S]
+
+Each run imports gui.main_gui, builds MainGUIWithSidebar and processes the
+first events, then reports which heavy libraries got imported along the
+way. Exits with status 1 when one of them is loaded at startup (they should
+only be imported when a feature is first used) or when the median start
+time exceeds --max-seconds.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported just to show the window
+HEAVY_MODULES = ["selenium", "pandas", "numpy", "openpyxl", "docx", "docxtpl", "docxcompose"]
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+t_qt = time.perf_counter()
+from gui.main_gui import MainGUIWithSidebar
+window = MainGUIWithSidebar("msedgedriver.exe")
+window.show()
+app.processEvents()
+t_end = time.perf_counter()
+print(json.dumps({
+    "qt": t_qt - t0,
+    "app": t_end - t_qt,
+    "total": t_end - t0,
+    "heavy": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_once():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True,
+        timeout=120,  # a modal dialog at startup would otherwise hang the benchmark
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    args = sys.argv[1:]
+    max_seconds = None
+    if "--max-seconds" in args:
+        i = args.index("--max-seconds")
+        max_seconds = float(args[i + 1])
+        del args[i:i + 2]
+    runs = int(args[0]) if args else 5
+
+    results = [run_once() for _ in range(runs)]
+    qt = statistics.median(r["qt"] for r in results)
+    app = statistics.median(r["app"] for r in results)
+    total = statistics.median(r["total"] for r in results)
+    heavy = sorted({m for r in results for m in r["heavy"]})
+
+    print(f"{runs} cold starts (median)")
+    print(f"Qt + QApplication : {qt:8.3f} s")
+    print(f"main window       : {app:8.3f} s")
+    print(f"total             : {total:8.3f} s")
+    print(f"heavy imports     : {', '.join(heavy) or 'none'}")
+
+    failed = False
+    if heavy:
+        print("FAIL: heavy libraries imported at startup")
+        failed = True
+    if max_seconds is not None and total > max_seconds:
+        print(f"FAIL: startup slower than {max_seconds} s")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from core.comparer import compare_excel_files_frame
+from core.result_writer import ResultWriter
+
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+SUMMARY_PREFIX = "Comparison_Summary_"
+
+SUMMARY_COLUMNS = [
+    "REFERENCE", "TARGET", "RESULT", "ROWS", "MATCH", "MISMATCH",
+    "MISSING", "UNEXPECTED", "DUPLICATE", "SECONDS", "MESSAGE",
+]
+
+
+def _excel_files(folder):
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(EXCEL_EXTENSIONS)
+        and not name.startswith(("~$", ".", SUMMARY_PREFIX))  # Excel locks, temp files, our summaries
+    )
+
+
+def pair_files(reference_dir, target_dir):
+    """
+    Pairs every target file with its reference template by name: the reference
+    whose file name (without extension) is the longest case-insensitive prefix
+    of the target's name wins, e.g. "EUC_CustomerInfo.xlsx" is the reference for
+    "EUC_CustomerInfo.xlsx" and "EUC_CustomerInfo_20261018.xlsx".
+
+    Returns:
+        Tuple (list of (reference_path, target_path), list of unpaired target paths)
+    """
+    references = sorted(
+        ((os.path.splitext(os.path.basename(p))[0].lower(), p) for p in _excel_files(reference_dir)),
+        key=lambda item: len(item[0]),
+        reverse=True,
+    )
+    pairs = []
+    unpaired = []
+    for target in _excel_files(target_dir):
+        stem = os.path.splitext(os.path.basename(target))[0].lower()
+        match = next((ref for ref_stem, ref in references if stem.startswith(ref_stem)), None)
+        if match is None or os.path.abspath(match) == os.path.abspath(target):
+            unpaired.append(target)
+        else:
+            pairs.append((match, target))
+    return pairs, unpaired
+
+
+def _compare_one(reference_path, target_path, compare_kwargs):
+    """Runs in a worker process; never raises so one bad file can't stop the batch."""
+    started = time.perf_counter()
+    result = {
+        "REFERENCE": os.path.basename(reference_path),
+        "TARGET": os.path.basename(target_path),
+    }
+    try:
+        _, result_df, _, _ = compare_excel_files_frame(reference_path, target_path, **compare_kwargs)
+        counts = result_df["STATUS"].value_counts()
+        result["RESULT"] = "MISMATCH" if counts.drop("MATCH", errors="ignore").any() else "MATCH"
+        result["ROWS"] = len(result_df)
+        for status in ("MATCH", "MISMATCH", "MISSING", "UNEXPECTED", "DUPLICATE"):
+            result[status] = int(counts.get(status, 0))
+        result["MESSAGE"] = "OK"
+    except Exception as e:
+        result["RESULT"] = "ERROR"
+        result["MESSAGE"] = str(e)
+    result["SECONDS"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def compare_directory(reference_dir, target_dir, summary_path=None, max_workers=None,
+                      on_file_done=None, **compare_kwargs):
+    """
+    Compares every target file in target_dir against its reference template in
+    reference_dir (see pair_files), spread over a process pool sized to the CPU
+    count, and writes one summary workbook.
+
+    Args:
+        reference_dir (str): Folder with the reference templates.
+        target_dir (str): Folder with the scraped files to check.
+        summary_path (str): Summary workbook; default
+            "<target_dir>/Comparison_Summary_<timestamp>.xlsx".
+        max_workers (int): Worker processes; default os.cpu_count().
+        on_file_done (callable): Optional callback(done, total, result_dict).
+        **compare_kwargs: Passed on to compare_excel_files_frame (e.g. key_columns).
+
+    Returns:
+        Tuple (summary_path, list of per-file result dicts)
+    """
+    pairs, unpaired = pair_files(reference_dir, target_dir)
+    if summary_path is None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        summary_path = os.path.join(target_dir, f"{SUMMARY_PREFIX}{stamp}.xlsx")
+
+    results = [
+        {"REFERENCE": "", "TARGET": os.path.basename(t), "RESULT": "UNPAIRED",
+         "MESSAGE": "No reference file matches this name"}
+        for t in unpaired
+    ]
+    total = len(pairs)
+    workers = max(1, min(max_workers or os.cpu_count() or 1, total or 1))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_compare_one, ref, tgt, compare_kwargs): (ref, tgt) for ref, tgt in pairs}
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                ref, tgt = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:  # worker process died
+                    result = {"REFERENCE": os.path.basename(ref), "TARGET": os.path.basename(tgt),
+                              "RESULT": "ERROR", "MESSAGE": f"Worker failed: {e}"}
+                results.append(result)
+                if on_file_done:
+                    on_file_done(done, total, result)
+        except BaseException:
+            # e.g. cancelled from on_file_done: don't start the files still queued
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+
+    results.sort(key=lambda r: r["TARGET"])
+    with ResultWriter(summary_path, SUMMARY_COLUMNS) as writer:
+        writer.write_rows(results)
+    return summary_path, results
@@ -0,0 +1,153 @@
+import csv
+import os
+from datetime import datetime
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from core.result_writer import ResultWriter
+from core.selector_index import build_selector_index
+from core.workflow_compiler import ExtractionError, compile_steps
+
+
+def iter_input_rows(input_path: str):
+    """
+    Streams rows of the input file (xlsx or csv) as dicts of column -> string.
+    The first row is treated as the header. Rows are read one at a time so
+    large input files never have to be fully loaded in memory.
+    """
+    ext = os.path.splitext(input_path)[1].lower()
+
+    if ext == ".csv":
+        with open(input_path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                yield {k: (v or "").strip() for k, v in row.items() if k}
+        return
+
+    wb = load_workbook(input_path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
+        header = [str(h).strip() if h is not None else "" for h in header]
+        for values in rows:
+            if values is None or all(v is None for v in values):
+                continue
+            yield {
+                col: ("" if val is None else str(val).strip())
+                for col, val in zip(header, values) if col
+            }
+    finally:
+        wb.close()
+
+
+def count_input_rows(input_path: str):
+    """
+    Number of data rows in the input file, for progress/ETA. xlsx files are
+    not scanned: the count comes from the sheet dimensions (blank rows
+    included), or None when the file doesn't record them.
+    """
+    ext = os.path.splitext(input_path)[1].lower()
+    if ext == ".csv":
+        with open(input_path, "r", encoding="utf-8-sig", newline="") as f:
+            return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+    wb = load_workbook(input_path, read_only=True)
+    try:
+        max_row = wb.active.max_row
+        return max(max_row - 1, 0) if max_row else None
+    finally:
+        wb.close()
+
+
+def _run_row(driver, plan, row):
+    # Every row starts from the top-level document, whatever frame
+    # the previous row ended in
+    driver.switch_to.default_content()
+    return plan.run(driver, row)
+
+
+def run_batch(driver, workflow, input_path, presets, team, screen, tab,
+              output_path=None, on_row_done=None, pool=None, start_url=None):
+    """
+    Runs the workflow once for every row of the input file, using the row as
+    the workflow context (so `input` steps with `value_from` pick up the
+    row's columns), and collects everything into one result table.
+
+    Args:
+        driver: Selenium WebDriver already on the page the workflow starts from.
+            May be None when `pool` is given.
+        workflow (list): Workflow steps (see workflow.json), compiled once per batch.
+        input_path (str): Excel/CSV file with one enquiry per row.
+        presets (dict): Loaded presets.
+        team, screen, tab (str): Preset location of the workflow's fields.
+        output_path (str): If set, each row's result is appended here (xlsx/csv)
+            as soon as it is scraped; the file is committed atomically at the end.
+        on_row_done (callable): Optional callback(row_number, row_result).
+        pool (DriverPool): If set, each row leases a warm session from the pool
+            instead of using `driver`, so worn-out sessions get recycled.
+        start_url (str): Page each pool session is sent to the first time it
+            serves this batch (it may come from an earlier test or batch).
+
+    Returns:
+        pandas.DataFrame with the input columns, extracted columns and
+        SCRAPINGSTATUS / SCRAPINGMSG / STARTTIME / ENDTIME per row. SCRAPINGSTATUS
+        is SCRAPED, PARTIAL (some fields not found; the rest are kept) or FAILED.
+    """
+    records = []
+    # Validate and resolve the workflow once; every row then just runs the plan.
+    # Raises WorkflowCompileError before the first row if any step is invalid.
+    index = build_selector_index(presets)
+    plan = compile_steps(workflow, index, team, screen, tab, batch_extract=True)
+    status_columns = ["SCRAPINGSTATUS", "SCRAPINGMSG", "STARTTIME", "ENDTIME"]
+    writer = None
+    started_sessions = set()  # pool sessions already sent to start_url in this batch
+
+    try:
+        for row_number, row in enumerate(iter_input_rows(input_path), start=1):
+            record = dict(row)
+            record["STARTTIME"] = datetime.now()
+            try:
+                if pool:
+                    with pool.lease() as session:
+                        if start_url and session not in started_sessions:
+                            session.driver.get(start_url)
+                            started_sessions.add(session)
+                        results = _run_row(session.driver, plan, row)
+                else:
+                    results = _run_row(driver, plan, row)
+                record.update(results)
+                record["SCRAPINGSTATUS"] = "SCRAPED"
+                record["SCRAPINGMSG"] = "OK"
+            except ExtractionError as e:
+                # Some fields missing: keep the values that were extracted
+                print(f"Row {row_number}: {e}")
+                record.update(e.results)
+                record["SCRAPINGSTATUS"] = "PARTIAL"
+                record["SCRAPINGMSG"] = str(e)
+            except Exception as e:
+                print(f"Row {row_number}: scraping failed: {e}")
+                record["SCRAPINGSTATUS"] = "FAILED"
+                record["SCRAPINGMSG"] = str(e)
+            record["ENDTIME"] = datetime.now()
+            records.append(record)
+
+            if output_path:
+                if writer is None:
+                    writer = ResultWriter(output_path, list(dict.fromkeys(list(row) + plan.output_names + status_columns)))
+                writer.write_row(record)
+
+            if on_row_done:
+                on_row_done(row_number, record)
+    except BaseException:
+        if writer is not None:
+            writer.abort()  # leave any previous output file untouched
+        raise
+
+    if output_path:
+        if writer is None:
+            writer = ResultWriter(output_path, plan.output_names + status_columns)
+        writer.close()
+
+    return pd.DataFrame.from_records(records)
@@ -1,80 +1,574 @@
 from datetime import datetime
+import json
+import os
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
+from core.result_writer import ResultWriter
+from core.template_cache import load_template
+from core.normalization import column_differs, load_rules, rule_for
 
 
-def compare_excel_files(reference_path: str, target_path: str, save_result: bool = True) -> tuple[str, str]:
+def column_differences(template_df, scraped_df, compare_columns=None, rules=None,
+                       on_progress=None) -> pd.DataFrame:
     """
-    Membandingkan file Excel berdasarkan struktur file acuan (template).
+    Mask selisih per kolom: DataFrame bool (kolom = compare_columns) sepanjang
+    template_df, True bila nilai acuan dan scraped berbeda (setelah normalisasi
+    `rules`). Baris yang tidak ada di scraped_df bernilai False.
+    on_progress (opsional) dipanggil on_progress(kolom_selesai, jumlah_kolom)
+    setelah setiap kolom; exception dari callback menghentikan perbandingan.
+    """
+    if compare_columns is None:
+        compare_columns = list(template_df.columns)
+
+    n_ref = len(template_df)
+    n = min(n_ref, len(scraped_df))
+
+    masks = {}
+    for col in compare_columns:
+        ref = template_df[col].to_numpy(dtype=object)[:n]
+        found = scraped_df[col].to_numpy(dtype=object)[:n]
+        rule = rule_for(rules, col)
+        differs = np.zeros(n_ref, dtype=bool)
+        if rule:
+            differs[:n] = column_differs(ref, found, rule)
+        else:
+            both_na = pd.isna(ref) & pd.isna(found)
+            differs[:n] = (ref != found) & ~both_na
+        masks[col] = differs
+        if on_progress:
+            on_progress(len(masks), len(compare_columns))
+    return pd.DataFrame(masks, index=pd.RangeIndex(n_ref), columns=compare_columns)
+
+
+def compare_frames(template_df, scraped_df, compare_columns=None, rules=None, differences=None) -> tuple[list, list]:
+    """
+    Membandingkan dua DataFrame baris per baris (berdasarkan posisi), per kolom
+    secara vektor. Pesan selisih hanya dibangun untuk baris yang berbeda.
+    `rules` adalah aturan normalisasi per kolom (lihat core.normalization);
+    pesan selisih tetap menampilkan nilai asli. `differences` adalah hasil
+    column_differences bila sudah dihitung.
+
+    Returns:
+        Tuple (status_list, status_msg_list) sepanjang template_df.
+    """
+    if compare_columns is None:
+        compare_columns = list(template_df.columns)
+    if differences is None:
+        differences = column_differences(template_df, scraped_df, compare_columns, rules)
+
+    n_ref = len(template_df)
+    n = min(n_ref, len(scraped_df))
+
+    # Kumpulkan pesan per baris, urut sesuai kolom template
+    diffs = {}
+    for col in compare_columns:
+        rows = np.flatnonzero(differences[col].to_numpy())
+        if not len(rows):
+            continue
+        ref = template_df[col].to_numpy(dtype=object)
+        found = scraped_df[col].to_numpy(dtype=object)
+        for i in rows:
+            diffs.setdefault(i, []).append(f"{col}: expected '{ref[i]}', found '{found[i]}'")
+
+    status_list = ["MATCH"] * n_ref
+    status_msg_list = ["OK"] * n_ref
+    for i, row_diffs in diffs.items():
+        status_list[i] = "MISMATCH"
+        status_msg_list[i] = ", ".join(row_diffs)
+    for i in range(n, n_ref):
+        status_list[i] = "MISMATCH"
+        status_msg_list[i] = "Row missing in scraped file"
+
+    return status_list, status_msg_list
+
+
+def _key_text(df, key_columns):
+    """Teks kunci per baris, mis. "Rel ID=123, Account=456"."""
+    parts = [key + "=" + df[key].astype(object).fillna("").astype(str) for key in key_columns]
+    text = parts[0]
+    for part in parts[1:]:
+        text = text + ", " + part
+    return text.tolist()
+
+
+def compare_frames_by_key(template_df, scraped_df, key_columns, compare_columns=None, rules=None,
+                          on_progress=None):
+    """
+    Membandingkan dua DataFrame dengan menyelaraskan baris berdasarkan kolom kunci
+    (hash join), bukan berdasarkan posisi baris. on_progress diteruskan ke
+    column_differences.
+
+    Status per baris scraped:
+        - MATCH / MISMATCH: kunci ditemukan tepat satu kali di kedua file
+        - UNEXPECTED: kunci tidak ada di file acuan
+        - DUPLICATE: kunci muncul lebih dari sekali di salah satu file
+
+    Returns:
+        Tuple:
+            - status_list, status_msg_list sepanjang scraped_df
+            - DataFrame baris acuan yang kuncinya tidak ada di file scraped (MISSING)
+            - dict jumlah per kategori
+            - mask selisih per kolom sepanjang scraped_df (lihat column_differences)
+    """
+    if compare_columns is None:
+        compare_columns = list(template_df.columns)
+    missing_keys = [k for k in key_columns if k not in template_df.columns or k not in scraped_df.columns]
+    if missing_keys:
+        raise KeyError(f"Key column(s) not found: {', '.join(missing_keys)}")
+    value_columns = [c for c in compare_columns if c not in key_columns]
+
+    ref = template_df.reset_index(drop=True)
+    tgt = scraped_df.reset_index(drop=True)
+    ref_dup = ref.duplicated(key_columns, keep=False).to_numpy()
+    tgt_dup = tgt.duplicated(key_columns, keep=False).to_numpy()
+
+    # Join scraped -> acuan (baris acuan unik saja) dengan posisi baris kedua sisi
+    ref_keys = ref[key_columns].assign(_ref_row=np.arange(len(ref)))
+    tgt_keys = tgt[key_columns].assign(_tgt_row=np.arange(len(tgt)))
+    joined = tgt_keys.merge(ref_keys, on=key_columns, how="left", sort=False)
+    joined = joined.drop_duplicates("_tgt_row").sort_values("_tgt_row")
+    ref_row = joined["_ref_row"].to_numpy()
+
+    n = len(tgt)
+    status_list = [""] * n
+    status_msg_list = [""] * n
+    tgt_key_text = _key_text(tgt, key_columns)
+
+    found = ~pd.isna(ref_row)
+    ref_row_int = np.where(found, ref_row, -1).astype(int)
+    dup_in_ref = np.zeros(n, dtype=bool)
+    dup_in_ref[found] = ref_dup[ref_row_int[found]]
+    dup = tgt_dup | dup_in_ref
+    matched = found & ~dup
+
+    for i in np.flatnonzero(dup):
+        where = "scraped file" if tgt_dup[i] else "reference file"
+        status_list[i] = "DUPLICATE"
+        status_msg_list[i] = f"Duplicate key in {where}: {tgt_key_text[i]}"
+    for i in np.flatnonzero(~found & ~tgt_dup):
+        status_list[i] = "UNEXPECTED"
+        status_msg_list[i] = f"Key not found in reference file: {tgt_key_text[i]}"
+
+    differences = pd.DataFrame(False, index=pd.RangeIndex(n), columns=value_columns)
+    tgt_pos = np.flatnonzero(matched)
+    if len(tgt_pos):
+        aligned_ref = ref.iloc[ref_row_int[tgt_pos]].reset_index(drop=True)
+        aligned_tgt = tgt.iloc[tgt_pos].reset_index(drop=True)
+        sub_differences = column_differences(aligned_ref, aligned_tgt, value_columns, rules, on_progress)
+        sub_status, sub_msgs = compare_frames(aligned_ref, aligned_tgt, value_columns, rules, sub_differences)
+        for pos, st, msg in zip(tgt_pos, sub_status, sub_msgs):
+            status_list[pos] = st
+            status_msg_list[pos] = msg
+        differences.iloc[tgt_pos] = sub_differences.to_numpy()
+
+    # Anti-join: baris acuan yang kuncinya sama sekali tidak ada di file scraped
+    in_tgt = ref_keys.merge(tgt[key_columns].drop_duplicates(), on=key_columns, how="left", indicator=True)
+    missing_df = ref[(in_tgt["_merge"] == "left_only").to_numpy()]
+
+    counts = {
+        "MATCH": status_list.count("MATCH"),
+        "MISMATCH": status_list.count("MISMATCH"),
+        "MISSING": len(missing_df),
+        "UNEXPECTED": status_list.count("UNEXPECTED"),
+        "DUPLICATE": status_list.count("DUPLICATE"),
+    }
+    return status_list, status_msg_list, missing_df, counts, differences
+
+
+def manifest_path_for(target_path: str) -> str:
+    """Lokasi manifest hash per baris, di samping file target."""
+    return target_path + ".compare-manifest.npz"
+
+
+def _manifest_meta(compare_columns, reference_key, rules):
+    return json.dumps({"columns": list(compare_columns), "reference_key": reference_key, "rules": rules or {}},
+                      sort_keys=True)
+
+
+def _load_compare_manifest(manifest_path, meta):
+    """
+    Manifest run sebelumnya sebagai dict array, atau None bila tidak ada, tidak
+    terbaca, atau dibuat dengan kolom/rules lain. Format .npz tanpa pickle:
+    membuka manifest tidak pernah menjalankan kode.
+    """
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with np.load(manifest_path, allow_pickle=False) as data:
+            previous = {name: data[name] for name in data.files}
+        stored = json.loads(str(previous.pop("meta")))
+        current = json.loads(meta)
+        n = len(previous["ref_hash"])
+        if (stored["columns"] != current["columns"] or stored["rules"] != current["rules"]
+                or any(len(previous[k]) != n for k in ("tgt_hash", "status", "status_msg", "differences"))):
+            return None
+        previous["reference_key"] = stored["reference_key"]
+        return previous
+    except Exception as e:
+        print(f"Ignoring unreadable manifest {manifest_path}: {e}")
+        return None
+
+
+def _save_compare_manifest(manifest_path, meta, ref_hash, tgt_hash, status, status_msg, differences):
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, meta=np.array(meta), ref_hash=ref_hash.astype(np.uint64), tgt_hash=tgt_hash.astype(np.uint64),
+                 status=np.array(status.tolist(), dtype=str), status_msg=np.array(status_msg.tolist(), dtype=str),
+                 differences=differences)
+    os.replace(tmp, manifest_path)
+
+
+def _row_hashes(df, columns):
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+
+def compare_frames_incremental(template_df, scraped_df, compare_columns, manifest_path, reference_key=None,
+                               rules=None, on_progress=None):
+    """
+    Seperti compare_frames, tetapi memakai manifest hash per baris dari run
+    sebelumnya: baris yang hash acuan dan hash target-nya tidak berubah memakai
+    kembali STATUS/STATUSMSG lama, hanya baris baru/berubah yang dibandingkan.
+    Manifest diperbarui setelah perbandingan.
+
+    reference_key (mis. path|mtime|size file acuan) opsional: jika sama dengan
+    run sebelumnya, hash baris acuan diambil dari manifest dan tidak dihitung ulang.
+    on_progress diteruskan ke column_differences (hanya untuk baris yang berubah).
+
+    Returns:
+        Tuple (status_list, status_msg_list, jumlah baris yang dipakai ulang,
+        mask selisih per kolom sepanjang template_df).
+    """
+    n_ref = len(template_df)
+    n = min(n_ref, len(scraped_df))
+    tgt_hash = _row_hashes(scraped_df.iloc[:n], compare_columns)
+
+    meta = _manifest_meta(compare_columns, reference_key, rules)
+    previous = _load_compare_manifest(manifest_path, meta)
+
+    if (previous is not None and reference_key is not None
+            and previous["reference_key"] == reference_key):
+        m = min(n, len(previous["ref_hash"]))
+        ref_hash = np.concatenate([
+            previous["ref_hash"][:m],
+            _row_hashes(template_df.iloc[m:n], compare_columns),
+        ]).astype(np.uint64)
+    else:
+        ref_hash = _row_hashes(template_df.iloc[:n], compare_columns)
+
+    reuse = np.zeros(n, dtype=bool)
+    status = np.empty(n, dtype=object)
+    status_msg = np.empty(n, dtype=object)
+    differs = np.zeros((n, len(compare_columns)), dtype=bool)
+    if previous is not None:
+        m = min(n, len(previous["ref_hash"]))
+        reuse[:m] = (
+            (previous["ref_hash"][:m] == ref_hash[:m])
+            & (previous["tgt_hash"][:m] == tgt_hash[:m])
+        )
+        # Hasil lama diambil dulu; baris yang berubah ditimpa di bawah
+        status[:m] = previous["status"][:m].tolist()
+        status_msg[:m] = previous["status_msg"][:m].tolist()
+        differs[:m] = previous["differences"][:m]
+
+    changed = np.flatnonzero(~reuse)
+    if len(changed):
+        changed_ref = template_df.iloc[changed].reset_index(drop=True)
+        changed_tgt = scraped_df.iloc[changed].reset_index(drop=True)
+        sub_differences = column_differences(changed_ref, changed_tgt, compare_columns, rules, on_progress)
+        sub_status, sub_msgs = compare_frames(changed_ref, changed_tgt, compare_columns, rules, sub_differences)
+        status[changed] = sub_status
+        status_msg[changed] = sub_msgs
+        differs[changed] = sub_differences.to_numpy()
+
+    _save_compare_manifest(manifest_path, meta, ref_hash, tgt_hash, status, status_msg, differs)
+
+    status_list = status.tolist() + ["MISMATCH"] * (n_ref - n)
+    status_msg_list = status_msg.tolist() + ["Row missing in scraped file"] * (n_ref - n)
+    differences = pd.DataFrame(
+        np.concatenate([differs, np.zeros((n_ref - n, len(compare_columns)), dtype=bool)]),
+        columns=compare_columns,
+    )
+    return status_list, status_msg_list, int(reuse.sum()), differences
+
+
+def iter_frames(path: str, chunk_size: int = 5000):
+    """
+    Membaca file Excel/CSV per potongan (chunk) sebagai DataFrame bertipe string,
+    sehingga memori tetap kecil berapa pun jumlah barisnya.
+    - .xlsx/.xlsm: openpyxl read-only
+    - .csv: pd.read_csv(chunksize=...)
+    - lainnya (.xls): dibaca penuh lalu dipotong (tidak hemat memori)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        yield from pd.read_csv(path, dtype=str, chunksize=chunk_size)
+        return
+    if ext not in (".xlsx", ".xlsm"):
+        df = pd.read_excel(path, dtype=str)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size].reset_index(drop=True)
+        return
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(h) if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+        width = len(header)
+        buffer = []
+        for values in rows:
+            if values is None or all(v is None for v in values):
+                continue
+            values = list(values[:width]) + [None] * (width - len(values))
+            buffer.append([np.nan if v is None else str(v) for v in values])
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=header, dtype=object)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=header, dtype=object)
+    finally:
+        wb.close()
+
+
+def compare_excel_files_streaming(reference_path: str, target_path: str, output_path: str | None = None,
+                                  chunk_size: int = 5000, max_log_rows: int = 1000,
+                                  rules: dict | None = None, on_progress=None) -> tuple[str, str]:
+    """
+    Versi streaming dari compare_excel_files untuk file yang sangat besar.
+    File acuan dan target dibaca per potongan secara berdampingan (berdasarkan
+    posisi baris), dibandingkan per potongan, dan hasilnya langsung ditulis,
+    sehingga pemakaian memori puncak tetap datar.
 
     Args:
         reference_path (str): Path file acuan/template.
         target_path (str): Path file hasil scraping yang ingin dicek.
-        save_result (bool): Jika True, hasil akan ditulis kembali ke file target.
+        output_path (str): Path file hasil; default "<target>_result.<ext>".
+            Target tidak di-overwrite karena masih dibaca saat hasil ditulis.
+        chunk_size (int): Jumlah baris per potongan.
+        max_log_rows (int): Batas jumlah baris MISMATCH yang dimasukkan ke log.
+        rules (dict): Aturan normalisasi per kolom; default dibaca dari
+            "<reference>.rules.json" (lihat core.normalization).
+        on_progress (callable): Opsional, dipanggil on_progress(baris_selesai, None)
+            setelah setiap potongan (total baris belum diketahui). Exception dari
+            callback menghentikan perbandingan dan file hasil lama tetap utuh.
 
     Returns:
         Tuple:
-            - Path ke file hasil (biasanya target_path yang di-overwrite)
-            - String ringkasan hasil (untuk ditampilkan ke GUI)
+            - Path ke file hasil
+            - String ringkasan hasil (jumlah per status + baris MISMATCH pertama)
+    """
+    try:
+        if output_path is None:
+            root, ext = os.path.splitext(target_path)
+            output_path = f"{root}_result{ext if ext.lower() in ('.csv', '.xlsx') else '.xlsx'}"
+
+        if rules is None:
+            rules = load_rules(reference_path)
+        ref_chunks = iter_frames(reference_path, chunk_size)
+        tgt_chunks = iter_frames(target_path, chunk_size)
+        start_time = datetime.now()
+        writer = ResultWriter(output_path)
+        compare_columns = None
+        target_columns = None
+        counts = {"MATCH": 0, "MISMATCH": 0}
+        log_lines = []
+        row_offset = 0
+
+        try:
+            while True:
+                ref_df = next(ref_chunks, None)
+                tgt_df = next(tgt_chunks, None)
+                if ref_df is None and tgt_df is None:
+                    break
+
+                if compare_columns is None:
+                    compare_columns = list(ref_df.columns) if ref_df is not None else []
+                if tgt_df is not None and target_columns is None:
+                    target_columns = list(tgt_df.columns)
+                if tgt_df is None:
+                    # Target sudah habis: sisa baris acuan menjadi "Row missing in scraped file"
+                    tgt_df = pd.DataFrame(columns=target_columns or compare_columns, dtype=object)
+                if ref_df is None:
+                    ref_df = pd.DataFrame(columns=compare_columns)
+                # read_csv(chunksize=...) mempertahankan nomor baris file sebagai index; selaraskan per posisi
+                ref_df = ref_df.reset_index(drop=True)
+                tgt_df = tgt_df.reset_index(drop=True)
+
+                status_list, status_msg_list = compare_frames(ref_df, tgt_df[compare_columns], compare_columns, rules)
+                extra = len(tgt_df) - len(ref_df)
+                if extra > 0:
+                    status_list += ["MISMATCH"] * extra
+                    status_msg_list += ["Row not found in reference file"] * extra
+                elif extra < 0:
+                    tgt_df = tgt_df.reindex(range(len(ref_df)))
+
+                result = tgt_df.assign(
+                    STATUS=status_list,
+                    STATUSMSG=status_msg_list,
+                    STARTTIME=start_time,
+                    ENDTIME=datetime.now(),
+                    SCRAPINGSTATUS="PROCESSED",
+                )
+                writer.write_frame(result)
+
+                for i, (status, msg) in enumerate(zip(status_list, status_msg_list)):
+                    counts[status] += 1
+                    if status == "MISMATCH" and len(log_lines) < max_log_rows:
+                        log_lines.append(f"Row {row_offset + i + 1}: {status} - {msg}")
+                row_offset += len(status_list)
+                if on_progress:
+                    on_progress(row_offset, None)
+        except Exception:
+            writer.abort()  # file hasil lama (jika ada) tetap utuh
+            raise
+
+        writer.close()
+
+        summary = ", ".join(f"{k}: {v}" for k, v in counts.items())
+        if counts["MISMATCH"] > len(log_lines):
+            summary += f" (showing first {len(log_lines)} mismatches)"
+        return output_path, "\n".join([summary] + log_lines)
+
+    except Exception as e:
+        raise RuntimeError(f"Comparison failed: {str(e)}")
+
+
+def compare_excel_files_frame(reference_path: str, target_path: str, save_result: bool = True,
+                              key_columns: list[str] | None = None, use_cache: bool = True,
+                              incremental: bool = False, rules: dict | None = None,
+                              on_progress=None) -> tuple[str, pd.DataFrame, list[str], pd.DataFrame]:
+    """
+    Sama seperti compare_excel_files, tetapi mengembalikan DataFrame hasil
+    (kolom target + STATUS, STATUSMSG, ...) alih-alih teks log per baris,
+    untuk ditampilkan di tabel (lihat gui.result_view).
+
+    Returns:
+        Tuple (path file hasil, DataFrame hasil, baris ringkasan, mask selisih
+        per kolom sejajar dengan baris DataFrame hasil; lihat column_differences)
     """
     try:
         # Baca file template dan file hasil scraping
-        template_df = pd.read_excel(reference_path, dtype=str)
+        if use_cache:
+            template_df = load_template(reference_path)
+        else:
+            template_df = pd.read_excel(reference_path, dtype=str)
+        if on_progress:
+            on_progress(0, None)  # file acuan sudah dibaca
         scraped_df = pd.read_excel(target_path, dtype=str)
 
+        if rules is None:
+            rules = load_rules(reference_path)
+
         # Tentukan kolom yang akan dibandingkan (mengikuti template)
         compare_columns = list(template_df.columns)
 
         # Filter scraped agar hanya memiliki kolom-kolom yang ingin dibandingkan
         filtered_scraped_df = scraped_df[compare_columns]
 
-        # Siapkan list untuk hasil per baris
-        status_list = []
-        status_msg_list = []
-        start_time = datetime.now()
+        total = len(scraped_df)
+        on_column = None
+        if on_progress:
+            on_progress(0, total)
 
-        for i in range(len(template_df)):
-            if i >= len(filtered_scraped_df):
-                status_list.append("MISMATCH")
-                status_msg_list.append("Row missing in scraped file")
-                continue
+            def on_column(done_columns, n_columns):
+                # Progres perbandingan dinyatakan dalam baris: total x bagian kolom yang selesai
+                on_progress(total * done_columns // max(n_columns, 1), total)
 
-            diffs = []
-            for col in compare_columns:
-                val_ref = template_df.iloc[i][col]
-                val_scraped = filtered_scraped_df.iloc[i][col]
-                if pd.isna(val_ref) and pd.isna(val_scraped):
-                    continue
-                if val_ref != val_scraped:
-                    # diffs.append(col)
-                    diffs.append(f"{col}: expected '{val_ref}', found '{val_scraped}'")
-
-            if diffs:
-                status_list.append("MISMATCH")
-                status_msg_list.append(", ".join(diffs))
-            else:
-                status_list.append("MATCH")
-                status_msg_list.append("OK")
+        start_time = datetime.now()
+        summary_lines = []
+        if key_columns:
+            status_list, status_msg_list, missing_df, counts, differences = compare_frames_by_key(
+                template_df, filtered_scraped_df, key_columns, compare_columns, rules, on_column
+            )
+            summary_lines.append(", ".join(f"{k}: {v}" for k, v in counts.items()))
+        elif incremental:
+            ref_stat = os.stat(reference_path)
+            reference_key = f"{os.path.abspath(reference_path)}|{ref_stat.st_mtime_ns}|{ref_stat.st_size}"
+            status_list, status_msg_list, reused, differences = compare_frames_incremental(
+                template_df, filtered_scraped_df, compare_columns, manifest_path_for(target_path), reference_key,
+                rules, on_column
+            )
+            summary_lines.append(f"Re-used {reused} unchanged rows, re-checked {len(status_list) - reused}")
+        else:
+            differences = column_differences(template_df, filtered_scraped_df, compare_columns, rules, on_column)
+            status_list, status_msg_list = compare_frames(
+                template_df, filtered_scraped_df, compare_columns, rules, differences
+            )
 
         # Tambahkan kolom hasil ke scraped_df
         scraped_df['STATUS'] = status_list
         scraped_df['STATUSMSG'] = status_msg_list
+
+        if key_columns and len(missing_df):
+            # Baris acuan yang tidak ditemukan ikut dicatat di file hasil
+            missing_rows = missing_df.assign(
+                STATUS="MISSING",
+                STATUSMSG=[f"Row missing in scraped file: {k}" for k in _key_text(missing_df, key_columns)],
+            )
+            scraped_df = pd.concat([scraped_df, missing_rows], ignore_index=True)
+            differences = differences.reindex(range(len(scraped_df)), fill_value=False)
         scraped_df['STARTTIME'] = start_time
         scraped_df['ENDTIME'] = datetime.now()
         scraped_df['SCRAPINGSTATUS'] = "PROCESSED"
 
-        # Simpan ke file (overwrite target)
+        if on_progress:
+            on_progress(len(scraped_df), len(scraped_df))
+
+        # Simpan ke file (overwrite target lewat file sementara + rename atomik)
         output_path = target_path
         if save_result:
-            scraped_df.to_excel(output_path, index=False)
-
-        # Buat log teks ringkasan
-        log_lines = [
-            f"Row {idx + 1}: {status} - {msg}"
-            for idx, (status, msg) in enumerate(zip(status_list, status_msg_list))
-        ]
-        log_text = "\n".join(log_lines)
+            with ResultWriter(output_path) as writer:
+                writer.write_frame(scraped_df)
 
-        return output_path, log_text
+        return output_path, scraped_df, summary_lines, differences
 
     except Exception as e:
         raise RuntimeError(f"Comparison failed: {str(e)}")
+
+
+def compare_excel_files(reference_path: str, target_path: str, save_result: bool = True,
+                        key_columns: list[str] | None = None, use_cache: bool = True,
+                        incremental: bool = False, rules: dict | None = None,
+                        on_progress=None) -> tuple[str, str]:
+    """
+    Membandingkan file Excel berdasarkan struktur file acuan (template).
+
+    Args:
+        reference_path (str): Path file acuan/template.
+        target_path (str): Path file hasil scraping yang ingin dicek.
+        save_result (bool): Jika True, hasil akan ditulis kembali ke file target.
+        key_columns (list[str]): Jika diisi, baris diselaraskan berdasarkan kolom
+            kunci ini (mis. ["Rel ID"]) dan baris acuan yang tidak ada di file
+            target ditambahkan dengan STATUS "MISSING".
+        use_cache (bool): Jika True, file acuan dibaca dari snapshot biner
+            (core.template_cache) selama file tersebut belum berubah.
+        incremental (bool): Jika True (mode posisi saja), hanya baris yang berubah
+            sejak run sebelumnya yang dibandingkan ulang; lihat
+            compare_frames_incremental. Manifest disimpan di samping target.
+        rules (dict): Aturan normalisasi per kolom (trim, casefold, numeric +
+            tolerance, date_format); default dibaca dari "<reference>.rules.json".
+        on_progress (callable): Opsional, dipanggil on_progress(baris_selesai, total)
+            setelah tiap file dibaca (total None sebelum target dibaca), setelah
+            setiap kolom dibandingkan, dan di akhir. Exception dari callback
+            membatalkan proses sebelum file target ditimpa.
+
+    Returns:
+        Tuple:
+            - Path ke file hasil (biasanya target_path yang di-overwrite)
+            - String ringkasan hasil (untuk ditampilkan ke GUI)
+    """
+    output_path, result_df, summary_lines, _ = compare_excel_files_frame(
+        reference_path, target_path, save_result, key_columns, use_cache, incremental, rules, on_progress
+    )
+
+    # Buat log teks ringkasan
+    log_lines = summary_lines + [
+        f"Row {idx + 1}: {status} - {msg}"
+        for idx, (status, msg) in enumerate(zip(result_df['STATUS'], result_df['STATUSMSG']))
+    ]
+    log_text = "\n".join(log_lines)
+
+    return output_path, log_text
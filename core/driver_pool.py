@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.edge.service import Service
+
+try:
+    import psutil
+except ImportError:  # RSS based recycling is skipped without psutil
+    psutil = None
+
+
+class PooledSession:
+    """A warm Edge session handed out by DriverPool."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.rows_done = 0
+        self.started_at = time.monotonic()
+
+    def rss_mb(self):
+        """
+        Resident memory of msedgedriver plus the Edge processes it spawned, in MB.
+        Returns None when psutil is not installed or the process is gone.
+        """
+        if psutil is None:
+            return None
+        try:
+            proc = psutil.Process(self.driver.service.process.pid)
+            procs = [proc] + proc.children(recursive=True)
+            total = 0
+            for p in procs:
+                try:
+                    total += p.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total / (1024 * 1024)
+        except (AttributeError, TypeError, psutil.Error):
+            return None
+
+
+class DriverPool:
+    """
+    Keeps `size` pre-launched Edge WebDriver sessions and leases them to jobs.
+
+    Sessions are health-checked with a cheap execute_script before each lease
+    and recycled (quit + relaunch) once they have served `max_rows` rows or
+    their RSS passes `max_rss_mb`, so long batch runs don't slowly degrade.
+    Callers waiting in acquire() are woken whenever a session is returned, a
+    slot is freed by recycling, or the pool is closed.
+    """
+
+    def __init__(self, driver_path, size=1, max_rows=200, max_rss_mb=1500):
+        self.driver_path = driver_path
+        self.size = size
+        self.max_rows = max_rows
+        self.max_rss_mb = max_rss_mb
+        self._cond = threading.Condition()  # guards everything below
+        self._idle = deque()
+        self._sessions = []
+        self._pending = 0  # slots reserved for sessions still being launched
+        self._closed = False
+
+    def start(self):
+        """Launches the pool's sessions up front."""
+        while True:
+            with self._cond:
+                if self._closed or not self._has_room():
+                    return self
+                self._pending += 1
+            session = self._launch()
+            with self._cond:
+                self._idle.append(session)
+                self._cond.notify()
+
+    def _has_room(self):
+        return len(self._sessions) + self._pending < self.size
+
+    def _launch(self):
+        """Launches a session into a slot already reserved by incrementing _pending."""
+        try:
+            service = Service(self.driver_path)
+            session = PooledSession(webdriver.Edge(service=service))
+        except BaseException:
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify_all()  # the slot is free again
+            raise
+        with self._cond:
+            self._pending -= 1
+            self._sessions.append(session)
+            count = len(self._sessions)
+        print(f"Driver pool: launched session ({count}/{self.size}).")
+        return session
+
+    def _discard(self, session, reserve=False):
+        """Quits a session; with reserve=True its slot is kept for a replacement."""
+        with self._cond:
+            if session in self._sessions:
+                self._sessions.remove(session)
+            if reserve:
+                self._pending += 1
+            else:
+                self._cond.notify_all()  # a waiter may launch into the freed slot
+        try:
+            session.driver.quit()
+        except Exception as e:
+            print(f"Driver pool: error while quitting session: {e}")
+
+    def _is_healthy(self, session):
+        try:
+            return session.driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _needs_recycle(self, session):
+        if self.max_rows and session.rows_done >= self.max_rows:
+            return True
+        if self.max_rss_mb:
+            rss = session.rss_mb()
+            if rss is not None and rss > self.max_rss_mb:
+                return True
+        return False
+
+    def acquire(self, timeout=None):
+        """
+        Returns a healthy session: an idle one, or a new one while the pool is
+        not full; otherwise waits (up to `timeout` seconds, None = forever) for
+        one to be returned or recycled. Raises TimeoutError when the wait times
+        out and RuntimeError when the pool is closed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    session = self._idle.popleft()
+                    break
+                if self._has_room():
+                    # Reserved under the lock, so concurrent callers can't
+                    # launch more than `size` sessions
+                    self._pending += 1
+                    session = None
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No driver session became available within {timeout} s")
+                self._cond.wait(remaining)
+
+        if session is None:
+            session = self._launch()
+        elif not self._is_healthy(session):
+            print("Driver pool: session failed health check, relaunching.")
+            self._discard(session, reserve=True)
+            session = self._launch()
+        return session
+
+    def release(self, session, rows=0):
+        """Returns a session to the pool, recycling it if it is worn out."""
+        session.rows_done += rows
+        if self._closed:
+            self._discard(session)
+            return
+        if self._needs_recycle(session):
+            print(f"Driver pool: recycling session after {session.rows_done} rows.")
+            self._discard(session)
+            return
+        with self._cond:
+            shrunk = len(self._sessions) > self.size
+        if shrunk:
+            print("Driver pool: closing session, pool size was reduced.")
+            self._discard(session)
+            return
+        with self._cond:
+            self._idle.append(session)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, rows=1, timeout=None):
+        """Context manager around acquire/release that counts `rows` on return."""
+        session = self.acquire(timeout=timeout)
+        try:
+            yield session
+        finally:
+            self.release(session, rows=rows)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            sessions = list(self._sessions)
+            self._idle.clear()
+            self._cond.notify_all()  # waiters in acquire() raise instead of hanging
+        for session in sessions:
+            self._discard(session)
+        print("Driver pool closed.")
@@ -1,20 +1,452 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from docx import Document
+from docxcompose.composer import Composer
 from docxtpl import DocxTemplate
+from jinja2 import Environment
 import pandas as pd
+import copy
+import hashlib
+import json
 import os
+import re
+import threading
 
-def generate_letters_from_excel(excel_path: str, template_path: str, output_dir: str):
+_INVALID_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|\r\n\t]+')
+
+# Template yang sudah diparse, per proses: abspath -> (mtime_ns, size, _ParsedTemplate)
+_template_cache = {}
+_template_lock = threading.Lock()
+
+
+class _CompilingEnvironment(Environment):
+    """Environment Jinja yang menyimpan hasil kompilasi per teks XML sumber."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._compiled = {}
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None:
+            return super().from_string(source, globals, template_class)
+        template = self._compiled.get(source)
+        if template is None:
+            template = self._compiled[source] = super().from_string(source)
+        return template
+
+
+class _ParsedTemplate:
+    """Template .docx yang dibuka, diparse, dan dikompilasi sekali."""
+
+    def __init__(self, template_path):
+        self.template_path = template_path
+        self.document = Document(template_path)  # tidak pernah dirender langsung
+        self.jinja_env = _CompilingEnvironment()
+        self.patched_xml = {}
+
+    def new_letter(self):
+        return _CachedDocxTemplate(self)
+
+
+class _CachedDocxTemplate(DocxTemplate):
+    """DocxTemplate di atas salinan dokumen yang sudah diparse; hasil patch_xml dipakai ulang."""
+
+    def __init__(self, parsed):
+        super().__init__(parsed.template_path)
+        self.docx = copy.deepcopy(parsed.document)
+        self._parsed = parsed
+
+    def patch_xml(self, src_xml):
+        patched = self._parsed.patched_xml.get(src_xml)
+        if patched is None:
+            patched = self._parsed.patched_xml[src_xml] = super().patch_xml(src_xml)
+        return patched
+
+    def render(self, context, jinja_env=None, autoescape=False):
+        super().render(context, jinja_env or self._parsed.jinja_env, autoescape)
+
+
+def get_template(template_path):
+    """
+    Template yang sudah diparse untuk template_path, dari cache bila file belum
+    berubah (mtime dan ukuran sama). Setiap surat dirender dari salinannya:
+    get_template(path).new_letter().
+    """
+    path = os.path.abspath(template_path)
+    st = os.stat(path)
+    with _template_lock:
+        cached = _template_cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        parsed = _ParsedTemplate(path)
+        _template_cache[path] = (st.st_mtime_ns, st.st_size, parsed)
+        return parsed
+
+
+def clear_template_cache():
+    with _template_lock:
+        _template_cache.clear()
+
+
+def _read_rows(excel_path):
     df = pd.read_excel(excel_path, dtype=str)
     df.rename(columns=lambda x: x.replace(" ", "_"), inplace=True)
+    return df
+
+
+def _letter_filenames(df):
+    """
+    Nama file per baris: Surat_<Nama_Nasabah>_<nomor baris>.docx.
+    Karakter yang tidak valid di Windows diganti "_", dan nama yang bentrok
+    (tanpa membedakan huruf besar/kecil) diberi akhiran agar tetap unik.
+    """
+    used = set()
+    names = []
+    for index, name in zip(df.index, df.get("Nama_Nasabah", pd.Series("User", index=df.index))):
+        if pd.isna(name) or not str(name).strip():
+            name = "User"
+        safe = _INVALID_FILENAME_CHARS.sub("_", str(name)).strip(" .") or "User"
+        filename = f"Surat_{safe}_{index+1}.docx"
+        n = 2
+        while filename.lower() in used:
+            filename = f"Surat_{safe}_{index+1}_{n}.docx"
+            n += 1
+        used.add(filename.lower())
+        names.append(filename)
+    return names
+
+
+LETTER_MANIFEST = ".letters-manifest.json"
+
+
+def _template_hash(template_path):
+    with open(template_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_letter_manifest(output_dir):
+    path = os.path.join(output_dir, LETTER_MANIFEST)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable letter manifest {path}: {e}")
+        return None
+
+
+def _save_letter_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, LETTER_MANIFEST)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+
+def _new_letter_manifest(df, template_path):
+    """Manifest kosong untuk df dan template ini, plus hash isi per baris."""
+    row_hashes = [format(h, "016x") for h in pd.util.hash_pandas_object(df, index=False)]
+    manifest = {"template": _template_hash(template_path), "columns": list(df.columns), "letters": {}}
+    return manifest, row_hashes
+
+
+def _plan_letters(df, filenames, template_path, output_dir):
+    """
+    Membandingkan baris sekarang dengan manifest run sebelumnya di output_dir.
+    Surat dicocokkan berdasarkan hash isi baris, bukan posisinya: bila baris
+    disisipkan/dihapus di Excel, surat yang isinya sama cukup diganti namanya
+    ke nama file barunya. Surat perlu dirender bila barisnya baru/berubah,
+    template atau kolom berubah, atau filenya sudah tidak ada.
+
+    Returns:
+        Tuple:
+            - (posisi baris, hash baris) yang perlu dirender
+            - manifest baru; "letters" berisi surat yang dipakai ulang saja
+            - (nama lama, nama baru) surat yang dipakai ulang dengan nama lain
+            - file lama yang barisnya sudah tidak ada
+    """
+    manifest, row_hashes = _new_letter_manifest(df, template_path)
+
+    previous = _load_letter_manifest(output_dir) or {}
+    old_letters = previous.get("letters", {})
+    if previous.get("template") != manifest["template"] or previous.get("columns") != manifest["columns"]:
+        reusable = {}
+    else:
+        reusable = {name: row_hash for name, row_hash in old_letters.items()
+                    if os.path.exists(os.path.join(output_dir, name))}
+
+    # Surat yang nama dan isinya tidak berubah tetap di tempat
+    used = set()
+    pending = []
+    for pos, (filename, row_hash) in enumerate(zip(filenames, row_hashes)):
+        if reusable.get(filename) == row_hash:
+            manifest["letters"][filename] = row_hash
+            used.add(filename)
+        else:
+            pending.append(pos)
+
+    # Sisanya: pakai surat lama dengan isi yang sama (baris yang bergeser), atau render
+    by_hash = {}
+    for name, row_hash in reusable.items():
+        if name not in used:
+            by_hash.setdefault(row_hash, []).append(name)
+    to_render = []
+    moves = []
+    for pos in pending:
+        candidates = by_hash.get(row_hashes[pos])
+        if candidates:
+            old_name = candidates.pop()
+            moves.append((old_name, filenames[pos]))
+            manifest["letters"][filenames[pos]] = row_hashes[pos]
+            used.add(old_name)
+        else:
+            to_render.append((pos, row_hashes[pos]))
+
+    current = set(filenames)  # file lama dengan nama yang masih dipakai akan ditimpa
+    stale = [name for name in old_letters if name not in used and name not in current]
+    return to_render, manifest, moves, stale
+
+
+def _reuse_letters(output_dir, moves, stale):
+    """Menghapus surat lama yang tidak terpakai dan mengganti nama surat yang bergeser."""
+    # Lewat nama sementara dulu: nama baru sebuah surat bisa jadi nama lama surat lain
+    staged = []
+    for old_name, new_name in moves:
+        tmp = os.path.join(output_dir, f"{old_name}.{os.getpid()}.moving")
+        os.replace(os.path.join(output_dir, old_name), tmp)
+        staged.append((tmp, new_name))
+    for name in stale:
+        try:
+            os.remove(os.path.join(output_dir, name))
+        except FileNotFoundError:
+            pass
+    for tmp, new_name in staged:
+        os.replace(tmp, os.path.join(output_dir, new_name))
+
+
+def generate_letters_from_excel(excel_path: str, template_path: str, output_dir: str,
+                                incremental: bool = True, on_progress=None):
+    """
+    Membuat satu Surat_*.docx per baris Excel di output_dir.
+
+    Dengan incremental=True (default) output_dir menyimpan manifest hash per
+    baris dan hash template (.letters-manifest.json): run berikutnya hanya
+    merender baris yang baru/berubah, mengganti nama surat yang barisnya hanya
+    bergeser, dan menghapus surat untuk baris yang sudah tidak ada. Ganti
+    template = semua surat dirender ulang. incremental=False merender semua
+    surat dan menulis ulang manifest.
+
+    on_progress (opsional) dipanggil on_progress(selesai, total) setelah setiap
+    surat; exception dari callback menghentikan proses (surat yang sudah jadi
+    tetap tercatat di manifest).
+    """
+    df = _read_rows(excel_path)
     os.makedirs(output_dir, exist_ok=True)
+    template = get_template(template_path)
+    filenames = _letter_filenames(df)
 
-    for index, row in df.iterrows():
-        doc = DocxTemplate(template_path)
-        context = row.to_dict()  # Isi variabel Word dengan data per baris
+    if incremental:
+        to_render, manifest, moves, stale = _plan_letters(df, filenames, template_path, output_dir)
+        _reuse_letters(output_dir, moves, stale)
+    else:
+        # Semua surat ditimpa; manifest ditulis ulang agar run incremental berikutnya tidak memakai entri lama
+        manifest, row_hashes = _new_letter_manifest(df, template_path)
+        to_render, stale = list(enumerate(row_hashes)), []
+    try:
+        for done, (pos, row_hash) in enumerate(to_render, start=1):
+            doc = template.new_letter()
+            doc.render(df.iloc[pos].to_dict())  # Isi variabel Word dengan data per baris
+            doc.save(os.path.join(output_dir, filenames[pos]))
+            manifest["letters"][filenames[pos]] = row_hash
+            if on_progress:
+                on_progress(done, len(to_render))
+    finally:
+        _save_letter_manifest(output_dir, manifest)  # surat yang sudah jadi tidak dirender ulang
+
+    msg = f"{len(to_render)} surat berhasil dibuat di folder: {output_dir}"
+    skipped = len(df) - len(to_render)
+    if skipped or stale:
+        msg += f"\n{skipped} surat tidak berubah (dilewati), {len(stale)} surat lama dihapus"
+    return msg
+
+
+def _render_chunk(template_path, jobs):
+    """Dijalankan di proses worker: render satu potongan baris, error per baris dicatat."""
+    results = []
+    try:
+        template = get_template(template_path)
+    except Exception as e:
+        return [{"row": row_number, "file": output_path, "success": False, "error": str(e)}
+                for row_number, _, output_path in jobs]
+    for row_number, context, output_path in jobs:
+        try:
+            doc = template.new_letter()
+            doc.render(context)
+            doc.save(output_path)
+            results.append({"row": row_number, "file": output_path, "success": True, "error": ""})
+        except Exception as e:
+            results.append({"row": row_number, "file": output_path, "success": False, "error": str(e)})
+    return results
+
+
+def generate_letters_parallel(excel_path: str, template_path: str, output_dir: str,
+                              max_workers: int | None = None, chunk_size: int = 25,
+                              on_progress=None, incremental: bool = True) -> list[dict]:
+    """
+    Seperti generate_letters_from_excel, tetapi baris dibagi ke beberapa proses
+    worker (default sebanyak jumlah CPU).
+
+    Args:
+        excel_path (str): File Excel sumber data.
+        template_path (str): Template Word (.docx).
+        output_dir (str): Folder output.
+        max_workers (int): Jumlah proses worker; default os.cpu_count().
+        chunk_size (int): Jumlah surat per tugas worker. Lebih kecil = progres
+            lebih sering dilaporkan.
+        on_progress (callable): Opsional, dipanggil on_progress(selesai, total, hasil_potongan)
+            setiap kali satu potongan selesai.
+        incremental (bool): Lewati baris yang tidak berubah sejak run sebelumnya,
+            lihat generate_letters_from_excel.
 
-        doc.render(context)
+    Returns:
+        List dict per baris: {"row", "file", "success", "error", "skipped"}, urut
+        nomor baris. Hanya baris yang dirender dilaporkan ke on_progress.
+    """
+    df = _read_rows(excel_path)
+    os.makedirs(output_dir, exist_ok=True)
+    filenames = _letter_filenames(df)
+
+    if incremental:
+        to_render, manifest, moves, stale = _plan_letters(df, filenames, template_path, output_dir)
+        _reuse_letters(output_dir, moves, stale)
+    else:
+        manifest, row_hashes = _new_letter_manifest(df, template_path)
+        to_render = list(enumerate(row_hashes))
+    render_positions = {pos for pos, _ in to_render}
+
+    jobs = [
+        (pos + 1, df.iloc[pos].to_dict(), os.path.join(output_dir, filenames[pos]))
+        for pos, _ in to_render
+    ]
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    total = len(jobs)
+    results = [
+        {"row": pos + 1, "file": os.path.join(output_dir, filename), "success": True, "error": "", "skipped": True}
+        for pos, filename in enumerate(filenames) if pos not in render_positions
+    ]
+    if not jobs:
+        _save_letter_manifest(output_dir, manifest)
+        return results
+
+    rendered = []
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(chunks)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_render_chunk, template_path, chunk): chunk for chunk in chunks}
+        try:
+            for future in as_completed(futures):
+                try:
+                    chunk_results = future.result()
+                except Exception as e:  # proses worker mati
+                    chunk_results = [
+                        {"row": row_number, "file": path, "success": False, "error": f"Worker failed: {e}"}
+                        for row_number, _, path in futures[future]
+                    ]
+                for r in chunk_results:
+                    r["skipped"] = False
+                rendered.extend(chunk_results)
+                if on_progress:
+                    on_progress(len(rendered), total, chunk_results)
+        except BaseException:
+            # mis. dibatalkan dari on_progress: potongan yang belum mulai tidak dijalankan
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        finally:
+            row_hashes = {pos + 1: row_hash for pos, row_hash in to_render}
+            for r in rendered:
+                if r["success"]:
+                    manifest["letters"][os.path.basename(r["file"])] = row_hashes[r["row"]]
+            _save_letter_manifest(output_dir, manifest)
+
+    results.extend(rendered)
+    results.sort(key=lambda r: r["row"])
+    return results
+
+
+MERGED_PREFIX = "Surat_Gabungan"
+MERGED_LETTERS_PER_FILE = 200  # batas memori: hanya satu dokumen sebesar ini yang disusun sekaligus
+
+
+def _save_composed(composer, path):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        composer.save(tmp)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def generate_merged_letters(excel_path: str, template_path: str, output_dir: str,
+                            letters_per_file: int | None = MERGED_LETTERS_PER_FILE,
+                            on_progress=None) -> list[dict]:
+    """
+    Seperti generate_letters_from_excel, tetapi semua surat digabung (docxcompose)
+    ke satu dokumen, dipisah page break, alih-alih ribuan file Surat_*.docx.
+    Setiap surat dirender lalu langsung ditambahkan ke dokumen gabungan, jadi
+    memori sebesar satu dokumen gabungan: dengan letters_per_file (default
+    200) itu terbatas; dengan 0/None semua surat ada di satu dokumen dan
+    memori tumbuh sebanding jumlah surat.
+
+    Args:
+        excel_path (str): File Excel sumber data.
+        template_path (str): Template Word (.docx).
+        output_dir (str): Folder output.
+        letters_per_file (int): Jumlah surat per dokumen gabungan
+            (Surat_Gabungan_001.docx, _002, ...). 0/None: semua di Surat_Gabungan.docx.
+        on_progress (callable): Opsional, dipanggil on_progress(selesai, total, hasil_baris).
+
+    Returns:
+        List dict per baris: {"row", "file", "success", "error"}; "file" adalah
+        dokumen gabungan tempat surat itu berada.
+    """
+    df = _read_rows(excel_path)
+    os.makedirs(output_dir, exist_ok=True)
+    template = get_template(template_path)
+    total = len(df)
+    results = []
+
+    def file_path(part):
+        if letters_per_file:
+            return os.path.join(output_dir, f"{MERGED_PREFIX}_{part:03d}.docx")
+        return os.path.join(output_dir, f"{MERGED_PREFIX}.docx")
+
+    part = 1
+    composer = None
+    in_file = 0
+    for index, row in df.iterrows():
+        result = {"row": index + 1, "file": file_path(part), "success": True, "error": ""}
+        try:
+            doc = template.new_letter()
+            doc.render(row.to_dict())
+            if composer is None:
+                composer = Composer(doc.docx)
+            else:
+                composer.doc.add_page_break()
+                composer.append(doc.docx)
+            in_file += 1
+        except Exception as e:
+            result.update(success=False, error=str(e))
+        results.append(result)
+        if on_progress:
+            on_progress(len(results), total, result)
 
-        filename = f"Surat_{row.get('Nama_Nasabah', 'User')}_{index+1}.docx"
-        output_path = os.path.join(output_dir, filename)
-        doc.save(output_path)
+        if composer is not None and letters_per_file and in_file >= letters_per_file:
+            _save_composed(composer, file_path(part))
+            part += 1
+            composer = None
+            in_file = 0
 
-    return f"{len(df)} surat berhasil dibuat di folder: {output_dir}"
\ No newline at end of file
+    if composer is not None:
+        _save_composed(composer, file_path(part))
+    return results
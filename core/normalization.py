@@ -0,0 +1,100 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Per-column normalization rules live next to the reference template:
+#   Template.xlsx -> Template.xlsx.rules.json
+#
+# {
+#     "*":       {"trim": true},
+#     "Name":    {"trim": true, "casefold": true},
+#     "Amount":  {"numeric": true, "tolerance": 0.01},
+#     "DOB":     {"date_format": ["%d/%m/%Y", "%Y-%m-%d"]}
+# }
+#
+# "*" applies to every column that has no rule of its own.
+RULE_KEYS = {"trim", "casefold", "numeric", "tolerance", "date_format"}
+
+
+def rules_path_for(reference_path):
+    return reference_path + ".rules.json"
+
+
+def load_rules(reference_path):
+    """Returns the normalization rules stored with the template, or {} if there are none."""
+    path = rules_path_for(reference_path)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    for col, rule in rules.items():
+        unknown = set(rule) - RULE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown normalization option(s) for '{col}': {', '.join(sorted(unknown))}")
+    return rules
+
+
+def save_rules(reference_path, rules):
+    with open(rules_path_for(reference_path), "w", encoding="utf-8") as f:
+        json.dump(rules, f, indent=4)
+
+
+def rule_for(rules, column):
+    if not rules:
+        return None
+    return rules.get(column, rules.get("*"))
+
+
+def _normalize_text(values, rule):
+    if rule.get("trim"):
+        values = values.str.strip()
+    if rule.get("casefold"):
+        values = values.str.casefold()
+    return values
+
+
+def _parse_numbers(values):
+    return pd.to_numeric(values.str.replace(",", "", regex=False), errors="coerce").to_numpy(dtype=float)
+
+
+def _parse_dates(values, formats):
+    if isinstance(formats, str):
+        formats = [formats]
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for fmt in formats:
+        parsed = parsed.fillna(pd.to_datetime(values, format=fmt, errors="coerce"))
+    return parsed.to_numpy()
+
+
+def column_differs(ref, found, rule=None):
+    """
+    Vectorized "values differ" mask for one column (two aligned Series of strings).
+    Missing on both sides counts as equal. With a rule, both sides are trimmed /
+    case-folded first, and numeric or date columns are compared as parsed values
+    (numbers within `tolerance`); cells that do not parse fall back to text equality.
+    """
+    ref = pd.Series(ref, dtype=object).reset_index(drop=True)
+    found = pd.Series(found, dtype=object).reset_index(drop=True)
+
+    if rule:
+        ref = _normalize_text(ref, rule)
+        found = _normalize_text(found, rule)
+
+    a = ref.to_numpy(dtype=object)
+    b = found.to_numpy(dtype=object)
+    both_na = pd.isna(a) & pd.isna(b)
+    differs = (a != b) & ~both_na
+
+    if rule and rule.get("numeric"):
+        na, nb = _parse_numbers(ref), _parse_numbers(found)
+        parsed = ~np.isnan(na) & ~np.isnan(nb)
+        tolerance = float(rule.get("tolerance", 0))
+        differs[parsed] = np.abs(na[parsed] - nb[parsed]) > tolerance + 1e-9
+    elif rule and rule.get("date_format"):
+        da, db = _parse_dates(ref, rule["date_format"]), _parse_dates(found, rule["date_format"])
+        parsed = ~pd.isna(da) & ~pd.isna(db)
+        differs[parsed] = da[parsed] != db[parsed]
+
+    return differs
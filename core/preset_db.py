@@ -0,0 +1,302 @@
+"""
+Optional SQLite backend for presets and workflows.
+
+presets.json / workflow.json are rewritten whole on every edit; with several
+batch workers and the GUI writing at once that loses updates. The database
+keeps one row per tab / field / workflow, updated in short IMMEDIATE
+transactions (WAL mode, so readers never block), and converts to and from
+the JSON files:
+
+    python -m core.preset_db import presets.db presets.json workflow.json
+    python -m core.preset_db export presets.db presets.json workflow.json
+
+Enable it for the app with presets.use_database("presets.db") or the
+PRESET_DB environment variable (see core.presets).
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+
+CREATE TABLE IF NOT EXISTS tabs (
+    id INTEGER PRIMARY KEY,
+    team TEXT NOT NULL,
+    screen TEXT NOT NULL,
+    tab TEXT NOT NULL,
+    UNIQUE (team, screen, tab)
+);
+
+CREATE TABLE IF NOT EXISTS fields (
+    tab_id INTEGER NOT NULL REFERENCES tabs(id) ON DELETE CASCADE,
+    field TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    spec TEXT NOT NULL,  -- JSON: {"type": ..., "selector"/"table_id"/"label": ...}
+    PRIMARY KEY (tab_id, field)
+);
+
+CREATE TABLE IF NOT EXISTS workflows (
+    position INTEGER PRIMARY KEY,
+    name TEXT,
+    team TEXT,
+    screen TEXT,
+    tab TEXT,
+    data TEXT NOT NULL  -- the workflow.json entry as JSON
+);
+CREATE INDEX IF NOT EXISTS workflows_by_tab ON workflows (team, screen, tab);
+"""
+
+
+class PresetDatabase:
+    def __init__(self, path="presets.db", timeout=30):
+        self.path = os.path.abspath(path)
+        self.timeout = timeout  # seconds to wait for another writer
+        self._local = threading.local()  # sqlite3 connections are per thread
+        self._conn().executescript(SCHEMA)  # idempotent, safe when several processes start at once
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self):
+        """One IMMEDIATE transaction: takes the write lock up front, bumps the version."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def version(self):
+        """Increases with every committed write, from any process."""
+        return self._conn().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    # --- presets ---
+
+    def load_presets(self):
+        """Nested {team: {screen: {tab: {field: spec}}}} in insertion order."""
+        presets = {}
+        conn = self._conn()
+        for team, screen, tab in conn.execute("SELECT team, screen, tab FROM tabs ORDER BY id"):
+            presets.setdefault(team, {}).setdefault(screen, {})[tab] = {}
+        rows = conn.execute(
+            "SELECT t.team, t.screen, t.tab, f.field, f.spec FROM fields f "
+            "JOIN tabs t ON t.id = f.tab_id ORDER BY f.tab_id, f.position"
+        )
+        for team, screen, tab, field, spec in rows:
+            presets[team][screen][tab][field] = json.loads(spec)
+        return presets
+
+    def get_fields(self, team, screen, tab):
+        rows = self._conn().execute(
+            "SELECT f.field, f.spec FROM fields f JOIN tabs t ON t.id = f.tab_id "
+            "WHERE t.team = ? AND t.screen = ? AND t.tab = ? ORDER BY f.position",
+            (team, screen, tab),
+        )
+        return {field: json.loads(spec) for field, spec in rows}
+
+    def get_field(self, team, screen, tab, field):
+        """Single (team, screen, tab, field) lookup through the primary-key indexes; None if absent."""
+        row = self._conn().execute(
+            "SELECT f.spec FROM fields f JOIN tabs t ON t.id = f.tab_id "
+            "WHERE t.team = ? AND t.screen = ? AND t.tab = ? AND f.field = ?",
+            (team, screen, tab, field),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _set_tab(conn, team, screen, tab, fields):
+        conn.execute("INSERT OR IGNORE INTO tabs (team, screen, tab) VALUES (?, ?, ?)", (team, screen, tab))
+        tab_id = conn.execute(
+            "SELECT id FROM tabs WHERE team = ? AND screen = ? AND tab = ?", (team, screen, tab)
+        ).fetchone()[0]
+        conn.execute("DELETE FROM fields WHERE tab_id = ?", (tab_id,))
+        conn.executemany(
+            "INSERT INTO fields (tab_id, field, position, spec) VALUES (?, ?, ?, ?)",
+            [(tab_id, field, pos, json.dumps(spec)) for pos, (field, spec) in enumerate(fields.items())],
+        )
+
+    def set_tab(self, team, screen, tab, fields):
+        """Adds or replaces one tab's fields; other tabs are not touched."""
+        with self._write() as conn:
+            self._set_tab(conn, team, screen, tab, fields)
+
+    def set_field(self, team, screen, tab, field, spec):
+        with self._write() as conn:
+            conn.execute("INSERT OR IGNORE INTO tabs (team, screen, tab) VALUES (?, ?, ?)", (team, screen, tab))
+            tab_id = conn.execute(
+                "SELECT id FROM tabs WHERE team = ? AND screen = ? AND tab = ?", (team, screen, tab)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO fields (tab_id, field, position, spec) VALUES (?, ?, "
+                "(SELECT COALESCE(MAX(position) + 1, 0) FROM fields WHERE tab_id = ?), ?) "
+                "ON CONFLICT (tab_id, field) DO UPDATE SET spec = excluded.spec",
+                (tab_id, field, tab_id, json.dumps(spec)),
+            )
+
+    def delete_tab(self, team, screen, tab):
+        with self._write() as conn:
+            conn.execute("DELETE FROM tabs WHERE team = ? AND screen = ? AND tab = ?", (team, screen, tab))
+
+    def delete_screen(self, team, screen):
+        with self._write() as conn:
+            conn.execute("DELETE FROM tabs WHERE team = ? AND screen = ?", (team, screen))
+
+    def delete_team(self, team):
+        with self._write() as conn:
+            conn.execute("DELETE FROM tabs WHERE team = ?", (team,))
+
+    def replace_presets(self, presets):
+        """
+        Makes the stored presets equal to `presets` in one transaction, writing
+        only the tabs that differ. This is a whole-snapshot save; use set_tab /
+        delete_* so concurrent edits to other tabs are never overwritten.
+        """
+        with self._write() as conn:
+            current = self.load_presets()
+            wanted = set()
+            for team, screens in presets.items():
+                for screen, tabs in screens.items():
+                    for tab, fields in tabs.items():
+                        wanted.add((team, screen, tab))
+                        if current.get(team, {}).get(screen, {}).get(tab) != fields:
+                            self._set_tab(conn, team, screen, tab, fields)
+            for team, screens in current.items():
+                for screen, tabs in screens.items():
+                    for tab in tabs:
+                        if (team, screen, tab) not in wanted:
+                            conn.execute(
+                                "DELETE FROM tabs WHERE team = ? AND screen = ? AND tab = ?", (team, screen, tab)
+                            )
+
+    # --- workflows ---
+
+    def load_workflows(self):
+        rows = self._conn().execute("SELECT data FROM workflows ORDER BY position")
+        return [json.loads(data) for (data,) in rows]
+
+    def get_workflow(self, team, screen, tab):
+        """Steps of the first workflow for team/screen/tab (indexed), or []."""
+        row = self._conn().execute(
+            "SELECT data FROM workflows WHERE team = ? AND screen = ? AND tab = ? ORDER BY position LIMIT 1",
+            (team, screen, tab),
+        ).fetchone()
+        return json.loads(row[0]).get("steps", []) if row else []
+
+    @staticmethod
+    def _workflow_row(wf):
+        return (wf.get("name"), wf.get("team"), wf.get("screen"), wf.get("tab"), json.dumps(wf))
+
+    def save_workflow(self, workflow):
+        """Adds or replaces the workflow named workflow["name"]; other workflows are not touched."""
+        name, team, screen, tab, data = self._workflow_row(workflow)
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT position FROM workflows WHERE name IS ? ORDER BY position LIMIT 1", (name,)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE workflows SET team = ?, screen = ?, tab = ?, data = ? WHERE position = ?",
+                    (team, screen, tab, data, row[0]),
+                )
+            else:
+                conn.execute(
+                    "INSERT INTO workflows (position, name, team, screen, tab, data) VALUES "
+                    "((SELECT COALESCE(MAX(position) + 1, 0) FROM workflows), ?, ?, ?, ?, ?)",
+                    (name, team, screen, tab, data),
+                )
+
+    def save_workflows(self, workflows):
+        """
+        Makes the stored workflows equal to `workflows`, matched by name: changed
+        entries are updated in place, new ones appended and only the names no
+        longer present deleted. Existing entries keep their position.
+        """
+        with self._write() as conn:
+            existing = {}
+            for position, name, data in conn.execute("SELECT position, name, data FROM workflows ORDER BY position"):
+                existing.setdefault(name, []).append((position, data))
+            for wf in workflows:
+                name, team, screen, tab, data = self._workflow_row(wf)
+                rows = existing.get(name)
+                if rows:
+                    position, old_data = rows.pop(0)  # the n-th entry of a name replaces the n-th row
+                    if old_data != data:
+                        conn.execute(
+                            "UPDATE workflows SET team = ?, screen = ?, tab = ?, data = ? WHERE position = ?",
+                            (team, screen, tab, data, position),
+                        )
+                else:
+                    conn.execute(
+                        "INSERT INTO workflows (position, name, team, screen, tab, data) VALUES "
+                        "((SELECT COALESCE(MAX(position) + 1, 0) FROM workflows), ?, ?, ?, ?, ?)",
+                        (name, team, screen, tab, data),
+                    )
+            conn.executemany(
+                "DELETE FROM workflows WHERE position = ?",
+                [(position,) for rows in existing.values() for position, _ in rows],
+            )
+
+    # --- JSON import / export ---
+
+    def import_json(self, presets_path=None, workflows_path=None):
+        """Loads presets.json / workflow.json (either may be None or missing) into the database."""
+        if presets_path and os.path.exists(presets_path):
+            with open(presets_path, "r", encoding="utf-8") as f:
+                self.replace_presets(json.load(f))
+        if workflows_path and os.path.exists(workflows_path):
+            with open(workflows_path, "r", encoding="utf-8") as f:
+                self.save_workflows(json.load(f))
+
+    def export_json(self, presets_path=None, workflows_path=None):
+        """Writes the database back out in the presets.json / workflow.json formats."""
+        for path, data, indent in ((presets_path, self.load_presets, 4), (workflows_path, self.load_workflows, 2)):
+            if not path:
+                continue
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data(), f, indent=indent)
+            os.replace(tmp, path)
+
+
+def main(argv):
+    if len(argv) < 2 or argv[0] not in ("import", "export"):
+        print(__doc__)
+        return 2
+    command, db_path = argv[0], argv[1]
+    presets_path = argv[2] if len(argv) > 2 else "presets.json"
+    workflows_path = argv[3] if len(argv) > 3 else "workflow.json"
+    db = PresetDatabase(db_path)
+    if command == "import":
+        db.import_json(presets_path, workflows_path)
+    else:
+        db.export_json(presets_path, workflows_path)
+    print(f"{command}: {db_path} <-> {presets_path}, {workflows_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,127 @@
+from core import presets
+
+# Change notifications sent to listeners as listener(kind, path), where path is
+# (team,), (team, screen) or (team, screen, tab):
+#   "insert" - a new node appended under path[:-1]
+#   "remove" - the node and everything under it is gone
+#   "update" - a tab's fields changed (the node itself stays)
+INSERT, REMOVE, UPDATE = "insert", "remove", "update"
+
+
+class PresetStore:
+    """
+    In-memory, editable copy of presets.json (Team > Screen > Tab > fields).
+    Edits are applied to memory and reported to listeners as fine-grained
+    changes; save() writes the file once, so callers can batch/debounce writes.
+    With the SQLite backend (presets.use_database) save() writes only the
+    changed tabs, so edits made meanwhile by other processes are kept.
+    """
+
+    def __init__(self):
+        self.data = presets.load_presets_for_edit()
+        self.dirty = False
+        self._changes = []  # (kind, path) since the last save
+        self._listeners = []
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self, kind, path):
+        self.dirty = True
+        self._changes.append((kind, path))
+        for listener in self._listeners:
+            listener(kind, path)
+
+    def reload(self):
+        """Discards unsaved edits and re-reads the file (listeners must reset themselves)."""
+        self.data = presets.load_presets_for_edit()
+        self.dirty = False
+        self._changes = []
+
+    def save(self):
+        if not self.dirty:
+            return
+        if presets.database() is not None:
+            self._save_changes()
+        else:
+            presets.save_presets(self.data)
+        self.dirty = False
+        self._changes = []
+
+    def _save_changes(self):
+        deleters = {1: presets.delete_team, 2: presets.delete_screen, 3: presets.delete_tab}
+        for kind, path in self._changes:
+            if kind == REMOVE:
+                deleters[len(path)](*path)
+                continue
+            for team, screen, tab in self._tabs_under(path):
+                presets.add_or_update_preset(team, screen, tab, self.get_fields(team, screen, tab))
+
+    def _tabs_under(self, path):
+        if len(path) == 3:
+            return [path] if path[2] in self.children(path[:2]) else []
+        return [tab_path for name in self.children(path) for tab_path in self._tabs_under(path + (name,))]
+
+    # --- reading ---
+
+    def children(self, path=()):
+        """Names directly under path: teams for (), screens for (team,), tabs for (team, screen)."""
+        node = self.data
+        for name in path:
+            node = node.get(name, {})
+        return list(node.keys())
+
+    def get_fields(self, team, screen, tab):
+        return self.data.get(team, {}).get(screen, {}).get(tab, {})
+
+    # --- editing ---
+
+    def set_tab(self, team, screen, tab, fields):
+        """Adds or replaces one tab, creating the team/screen when needed."""
+        if team not in self.data:
+            self.data[team] = {screen: {tab: fields}}
+            self._notify(INSERT, (team,))
+        elif screen not in self.data[team]:
+            self.data[team][screen] = {tab: fields}
+            self._notify(INSERT, (team, screen))
+        elif tab not in self.data[team][screen]:
+            self.data[team][screen][tab] = fields
+            self._notify(INSERT, (team, screen, tab))
+        elif self.data[team][screen][tab] != fields:
+            self.data[team][screen][tab] = fields
+            self._notify(UPDATE, (team, screen, tab))
+
+    def set_screen(self, team, screen, tabs):
+        """Replaces all tabs of a screen; only tabs that actually changed are reported."""
+        removed = [t for t in self.data.get(team, {}).get(screen, {}) if t not in tabs]
+        # New tabs go in first, so removing the old ones never empties the
+        # screen and cascades into removing (and re-adding) the screen/team
+        for tab, fields in tabs.items():
+            self.set_tab(team, screen, tab, fields)
+        for tab in removed:
+            self.delete_tab(team, screen, tab)
+
+    def delete_tab(self, team, screen, tab):
+        """Removes a tab; a screen or team left empty is removed with it."""
+        try:
+            del self.data[team][screen][tab]
+        except KeyError:
+            return
+        if not self.data[team][screen]:
+            self.delete_screen(team, screen)
+        else:
+            self._notify(REMOVE, (team, screen, tab))
+
+    def delete_screen(self, team, screen):
+        try:
+            del self.data[team][screen]
+        except KeyError:
+            return
+        if not self.data[team]:
+            self.delete_team(team)
+        else:
+            self._notify(REMOVE, (team, screen))
+
+    def delete_team(self, team):
+        if self.data.pop(team, None) is not None:
+            self._notify(REMOVE, (team,))
@@ -1,18 +1,148 @@
 import json
 import os
+import threading
+from types import MappingProxyType
+
+from core.selector_index import build_selector_index
 
 PRESET_FILE = "presets.json"
 WORKFLOW_PATH = "workflow.json"
+PRESET_DB_ENV = "PRESET_DB"  # path of an SQLite preset database to use instead of the JSON files
+
+# Process-wide cache of parsed JSON files: abspath -> (mtime_ns, size, frozen data).
+# A file is only re-read and re-parsed when its mtime or size changes.
+_cache = {}
+_cache_lock = threading.RLock()
+_selector_index = None  # (presets view it was built from, SelectorIndex)
+_db = None  # core.preset_db.PresetDatabase when the SQLite backend is enabled
+
+
+def _freeze(obj):
+    """Read-only view of parsed JSON: dicts -> MappingProxyType, lists -> tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+def _thaw(obj):
+    """Plain, mutable (and JSON serialisable) copy of a frozen view."""
+    if isinstance(obj, (dict, MappingProxyType)):
+        return {k: _thaw(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_thaw(v) for v in obj]
+    return obj
+
+
+def _load_cached(path, default):
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        return default
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+        with open(key, "r", encoding="utf-8") as f:
+            data = _freeze(json.load(f))
+        _cache[key] = (st.st_mtime_ns, st.st_size, data)
+        return data
+
+
+def _write_cached(path, data, indent):
+    key = os.path.abspath(path)
+    data = _thaw(data)
+    with _cache_lock:
+        # Temp file + rename so readers (or a crash) never see a half-written file
+        tmp = f"{key}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp, key)
+        st = os.stat(key)
+        _cache[key] = (st.st_mtime_ns, st.st_size, _freeze(data))
+
+
+def _load_db_cached(name, loader):
+    """Like _load_cached for the database: re-read only after a write (from any process)."""
+    version = _db.version()
+    with _cache_lock:
+        entry = _cache.get(("db", name))
+        if entry and entry[0] == _db.path and entry[1] == version:
+            return entry[2]
+        data = _freeze(loader())
+        _cache[("db", name)] = (_db.path, version, data)
+        return data
+
+
+def use_database(path):
+    """
+    Switches presets/workflows to the SQLite backend (core.preset_db) at path,
+    or back to the JSON files with path=None. Convert existing files with
+    `python -m core.preset_db import <db> presets.json workflow.json`.
+    """
+    global _db
+    if path:
+        from core.preset_db import PresetDatabase
+        _db = PresetDatabase(path)
+    else:
+        _db = None
+    clear_cache()
+
+
+def database():
+    """The active PresetDatabase, or None when the JSON files are used."""
+    return _db
+
+
+def clear_cache():
+    global _selector_index
+    with _cache_lock:
+        _cache.clear()
+        _selector_index = None
+
 
 def load_presets():
-    if not os.path.exists(PRESET_FILE):
-        return []
-    with open(PRESET_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Returns a read-only view of presets.json, re-parsed only when the file changes."""
+    if _db is not None:
+        return _load_db_cached("presets", _db.load_presets)
+    return _load_cached(PRESET_FILE, MappingProxyType({}))
+
+def load_presets_for_edit():
+    """Returns a mutable copy of the presets, to be modified and passed to save_presets()."""
+    return _thaw(load_presets())
+
+def get_selector_index():
+    """
+    Returns the flat SelectorIndex for the current presets.json, compiled once
+    per preset version (rebuilt only after the cached presets are reloaded).
+    """
+    global _selector_index
+    presets = load_presets()
+    with _cache_lock:
+        if _selector_index is None or _selector_index[0] is not presets:
+            try:
+                workflows = load_workflows()
+            except (FileNotFoundError, ValueError):
+                workflows = None
+            _selector_index = (presets, build_selector_index(presets, workflows))
+        return _selector_index[1]
 
 def load_workflows():
-    with open(WORKFLOW_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """
+    Returns a read-only view of workflow.json as a tuple of workflow entries,
+    re-parsed only when the file changes. A file holding a single workflow
+    object (as written by core.workflow.Workflow.save_to_file) is one entry.
+    """
+    if _db is not None:
+        return _load_db_cached("workflows", _db.load_workflows)
+    workflows = _load_cached(WORKFLOW_PATH, None)
+    if workflows is None:
+        raise FileNotFoundError(WORKFLOW_PATH)
+    if isinstance(workflows, MappingProxyType):
+        return (workflows,)
+    return workflows
     
 def get_fields(team, screen, tab):
     presets = load_presets()
@@ -22,16 +152,54 @@ def get_fields(team, screen, tab):
         return {}
 
 def save_presets(presets):
-    with open(PRESET_FILE, "w", encoding="utf-8") as f:
-        json.dump(presets, f, indent=4)
+    if _db is not None:
+        _db.replace_presets(_thaw(presets))
+        return
+    _write_cached(PRESET_FILE, presets, indent=4)
+
+def load_workflows_for_edit():
+    """Returns a mutable copy of the workflows, to be modified and passed to save_workflows()."""
+    return _thaw(load_workflows())
+
+def save_workflows(workflows):
+    if _db is not None:
+        _db.save_workflows(_thaw(workflows))
+        return
+    _write_cached(WORKFLOW_PATH, workflows, indent=2)
+
+def save_workflow(workflow):
+    """
+    Adds or replaces (by name) one workflow entry, e.g. a core.workflow.Workflow
+    dict from the Workflow Manager; the other entries are left as they are.
+    """
+    if _db is not None:
+        _db.save_workflow(_thaw(workflow))  # row-level: other workflows untouched
+        return
+    try:
+        workflows = load_workflows_for_edit()
+    except FileNotFoundError:
+        workflows = []
+    for pos, wf in enumerate(workflows):
+        if isinstance(wf, dict) and wf.get("name") == workflow.get("name"):
+            workflows[pos] = _thaw(workflow)
+            break
+    else:
+        workflows.append(_thaw(workflow))
+    save_workflows(workflows)
 
 def get_workflow(team, screen, tab):
+    if _db is not None:
+        return _db.get_workflow(team, screen, tab)
     workflows = load_workflows()
     for wf in workflows:
-        if wf["team"] == team and wf["screen"] == screen and wf["tab"] == tab:
+        if isinstance(wf, MappingProxyType) and (wf.get("team"), wf.get("screen"), wf.get("tab")) == (team, screen, tab):
             return wf["steps"]
     return []
 
+def get_workflows_for_team(team):
+    # Entries without a team (Workflow Manager workflows) belong to no team
+    return [wf for wf in load_workflows() if isinstance(wf, MappingProxyType) and wf.get("team") == team]
+
 def get_team_names():
     presets = load_presets()
     return list(presets.keys())
@@ -51,7 +219,11 @@ def add_or_update_preset(team, screen, tab, fields):
     Adds or updates the preset for a specific team/screen/tab.
     Fields is a dictionary of field_name -> {type, selector/...}
     """
-    presets_data = load_presets()
+    if _db is not None:
+        _db.set_tab(team, screen, tab, fields)  # row-level: other tabs untouched
+        return
+
+    presets_data = load_presets_for_edit()
 
     if team not in presets_data:
         presets_data[team] = {}
@@ -65,7 +237,10 @@ def add_or_update_preset(team, screen, tab, fields):
 
 
 def delete_tab(team, screen, tab):
-    data = load_presets()
+    if _db is not None:
+        _db.delete_tab(team, screen, tab)
+        return
+    data = load_presets_for_edit()
     try:
         del data[team][screen][tab]
         if not data[team][screen]:
@@ -77,7 +252,10 @@ def delete_tab(team, screen, tab):
         pass
 
 def delete_screen(team, screen):
-    data = load_presets()
+    if _db is not None:
+        _db.delete_screen(team, screen)
+        return
+    data = load_presets_for_edit()
     try:
         del data[team][screen]
         if not data[team]:
@@ -87,7 +265,10 @@ def delete_screen(team, screen):
         pass
 
 def delete_team(team):
-    data = load_presets()
+    if _db is not None:
+        _db.delete_team(team)
+        return
+    data = load_presets_for_edit()
     try:
         del data[team]
         save_presets(data)
@@ -105,3 +286,7 @@ def get_all_presets():
             for tab in tabs:
                 flat.append((team, screen, tab))
     return flat
+
+
+if os.environ.get(PRESET_DB_ENV):
+    use_database(os.environ[PRESET_DB_ENV])
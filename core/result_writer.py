@@ -0,0 +1,138 @@
+import csv
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+from openpyxl import Workbook
+
+
+class ResultWriter:
+    """
+    Streams result rows to a write-only .xlsx or a .csv file.
+
+    Rows go to a temp file in the destination folder, which replaces the
+    destination atomically (os.replace) on close(). A crash or abort() leaves
+    any existing file at `path` untouched. Usable as a context manager:
+    the file is committed on success and discarded on exception.
+
+    Columns are fixed by the first write (or passed in up front); keys of
+    later dict rows that are not in the columns are ignored.
+    """
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = list(columns) if columns is not None else None
+        self.is_csv = path.lower().endswith(".csv")
+        self.rows_written = 0
+        self._tmp_path = None
+        self._file = None
+        self._csv = None
+        self._wb = None
+        self._ws = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def _open(self):
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        suffix = os.path.splitext(self.path)[1] or ".xlsx"
+        fd, self._tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=suffix, dir=folder)
+        if self.is_csv:
+            self._file = os.fdopen(fd, "w", encoding="utf-8", newline="")
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(self.columns)
+        else:
+            os.close(fd)
+            self._wb = Workbook(write_only=True)
+            self._ws = self._wb.create_sheet("Sheet1")
+            self._ws.append(self.columns)
+
+    def _write_values(self, rows):
+        if self._tmp_path is None:
+            self._open()
+        count = 0
+        if self.is_csv:
+            for row in rows:
+                self._csv.writerow(row)
+                count += 1
+            self._file.flush()
+        else:
+            for row in rows:
+                self._ws.append(row)
+                count += 1
+        self.rows_written += count
+
+    @staticmethod
+    def _clean(value):
+        try:
+            return None if pd.isna(value) else value
+        except (TypeError, ValueError):
+            return value
+
+    def write_row(self, row):
+        """Writes one dict (column -> value) or sequence in column order."""
+        self.write_rows([row])
+
+    def write_rows(self, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        if self.columns is None:
+            first = rows[0]
+            if not isinstance(first, dict):
+                raise ValueError("Columns must be given before writing sequence rows")
+            self.columns = list(first.keys())
+        self._write_values(
+            [self._clean(row.get(col)) for col in self.columns] if isinstance(row, dict)
+            else [self._clean(v) for v in row]
+            for row in rows
+        )
+
+    def write_frame(self, df):
+        """Writes a DataFrame chunk; its columns fix the header if not set yet."""
+        if self.columns is None:
+            self.columns = [str(c) for c in df.columns]
+        values = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        self._write_values(list(row) for row in values)
+
+    def close(self):
+        """Finishes the file and moves it over `path`. Returns the path."""
+        if self._tmp_path is None:
+            # Nothing written yet: still produce a file with the header
+            self.columns = self.columns or []
+            self._open()
+        if self.is_csv:
+            self._file.close()
+        else:
+            self._wb.save(self._tmp_path)
+        self._copy_mode()
+        os.replace(self._tmp_path, self.path)
+        self._tmp_path = None
+        return self.path
+
+    def _copy_mode(self):
+        # mkstemp creates the temp file as 0600; give it the permissions the
+        # destination has (or a new file would get) before it takes its place
+        if os.path.exists(self.path):
+            shutil.copymode(self.path, self._tmp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(self._tmp_path, 0o666 & ~umask)
+
+    def abort(self):
+        """Discards the temp file; `path` is left as it was."""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+        if self._tmp_path and os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+        self._tmp_path = None
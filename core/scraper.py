@@ -4,11 +4,29 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.edge.service import Service
+from selenium.common.exceptions import TimeoutException
+
+# Reads "#<table_id> tbody tr" once into {first cell text: second cell text};
+# the first row wins when a label repeats, as in the old row-by-row scan
+TABLE_INDEX_JS = """
+const index = {};
+const rows = document.querySelectorAll("#" + CSS.escape(arguments[0]) + " tbody tr");
+for (const row of rows) {
+    const cells = row.querySelectorAll("td");
+    if (cells.length === 0) continue;
+    const label = (cells[0].innerText || "").trim();
+    if (!(label in index)) {
+        index[label] = cells.length > 1 ? (cells[1].innerText || "").trim() : "";
+    }
+}
+return index;
+"""
 
 class Scraper:
     def __init__(self, driver_path):
         self.driver = None
         self.driver_path = driver_path
+        self.window_wait_times = []  # seconds each popup took to appear, for tuning timeouts
 
     def start_browser(self, url):
         # Use the Service class to specify the WebDriver path
@@ -23,15 +41,26 @@ class Scraper:
         if file_path:
             self.file_path_entry.setText(file_path)
             
-    def wait_for_new_window(self):
+    def wait_for_new_window(self, timeout=20, poll_interval=0.05):
+        """
+        Waits until a window other than the current one exists, switches to it
+        and returns its title. Returns None after `timeout` seconds.
+        """
         original_window = self.driver.current_window_handle
-        for _ in range(20):
-            time.sleep(1)
-            if len(self.driver.window_handles) > 1:
-                new_window = [w for w in self.driver.window_handles if w != original_window][0]
-                self.driver.switch_to.window(new_window)
-                return self.driver.title
-        return None
+        started = time.perf_counter()
+        try:
+            new_window = WebDriverWait(self.driver, timeout, poll_frequency=poll_interval).until(
+                lambda d: next((w for w in d.window_handles if w != original_window), False)
+            )
+        except TimeoutException:
+            print(f"No new window appeared within {timeout}s.")
+            return None
+
+        elapsed = time.perf_counter() - started
+        self.window_wait_times.append(elapsed)
+        print(f"New window appeared after {elapsed:.3f}s.")
+        self.driver.switch_to.window(new_window)
+        return self.driver.title
 
     def scrape_data(self, fields):
         try:
@@ -42,6 +71,7 @@ class Scraper:
 
             if self.driver.find_elements(By.ID, "info-table"):
                 print("Info table found.")
+                table_indexes = {}  # table_id -> {label: value}, read once per table
                 for label, selector in fields.items():
                     try:
                         if selector["type"] == "css":
@@ -50,12 +80,11 @@ class Scraper:
                         elif selector["type"] == "table_lookup":
                             table_id = selector["table_id"]
                             label_text = selector["label"]
-                            rows = self.driver.find_elements(By.CSS_SELECTOR, f"#{table_id} tbody tr")
-                            for row in rows:
-                                cells = row.find_elements(By.TAG_NAME, "td")
-                                if cells and cells[0].text.strip() == label_text:
-                                    print(f"{label}: {cells[1].text.strip()}")
-                                    break
+                            if table_id not in table_indexes:
+                                table_indexes[table_id] = self.read_table_index(table_id)
+                            index = table_indexes[table_id]
+                            if label_text in index:
+                                print(f"{label}: {index[label_text]}")
                             else:
                                 print(f"{label}: [NOT FOUND]")
                     except Exception as e:
@@ -65,6 +94,10 @@ class Scraper:
         except Exception as e:
             print("Error in scraping logic:", e)
 
+    def read_table_index(self, table_id):
+        """Returns {label: value} for the rows of table `table_id` in one script call."""
+        return self.driver.execute_script(TABLE_INDEX_JS, table_id) or {}
+
     def close_browser(self):
         if self.driver:
             self.driver.quit()
@@ -0,0 +1,122 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class SelectorRecord:
+    key: str  # e.g., "EUC/Relationship Individual/Main/RELID"
+    team: str
+    screen: str
+    tab: str
+    field: str
+    type: str  # "css" or "table_lookup"
+    selector: Optional[str] = None  # css
+    table_id: Optional[str] = None  # table_lookup
+    label: Optional[str] = None  # table_lookup
+    enabled: bool = True
+
+
+def make_key(team, screen, tab, field_name):
+    return f"{team}/{screen}/{tab}/{field_name}"
+
+
+@dataclass
+class SelectorIndex:
+    """
+    Flat "team/screen/tab/field" -> SelectorRecord map compiled from the
+    nested presets dict. Tab and field names may themselves contain "/"
+    (e.g. "friends/relative"), so keys are only ever built, never split:
+    use the record's team/screen/tab/field attributes instead.
+    """
+    records: Dict[str, SelectorRecord] = field(default_factory=dict)
+    problems: List[str] = field(default_factory=list)
+
+    def __contains__(self, key):
+        return key in self.records
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, key, default=None):
+        return self.records.get(key, default)
+
+    def lookup(self, team, screen, tab, field_name):
+        return self.records.get(make_key(team, screen, tab, field_name))
+
+    def require(self, key):
+        try:
+            return self.records[key]
+        except KeyError:
+            raise Exception(f"Selector not found for {key}")
+
+    def check_workflows(self, workflows):
+        """
+        Reports workflow steps whose field has no selector. Accepts both
+        workflow.json entries ({name, team, screen, tab, steps: [{field, ...}]})
+        and core.workflow.Workflow dicts ({name, steps: [{selector_key, ...}]}),
+        as a list or a single entry. Entries that are neither are reported as
+        problems and skipped. Returns the list of dangling keys.
+        """
+        if isinstance(workflows, Mapping):
+            workflows = [workflows]
+        dangling = []
+        for pos, wf in enumerate(workflows, start=1):
+            if not isinstance(wf, Mapping):
+                self.problems.append(f"workflow entry {pos} is not a workflow object, skipped")
+                continue
+            name = wf.get("name", "Unnamed Workflow")
+            for step in wf.get("steps", []):
+                if not isinstance(step, Mapping):
+                    self.problems.append(f"{name}: step {step!r} is not a step object, skipped")
+                    continue
+                if step.get("selector_key"):
+                    key = step["selector_key"]
+                elif step.get("field"):
+                    key = make_key(wf.get("team"), wf.get("screen"), wf.get("tab"), step["field"])
+                else:
+                    continue  # e.g. wait steps
+                if key not in self.records:
+                    dangling.append(key)
+                    self.problems.append(f"{name}: dangling selector {key}")
+        return dangling
+
+
+def build_selector_index(presets, workflows=None):
+    """
+    Compiles the nested presets[team][screen][tab][field] dict into a SelectorIndex.
+    Malformed fields are skipped and recorded in index.problems; if workflows
+    are given, their dangling field references are recorded there as well.
+    """
+    index = SelectorIndex()
+    for team, screens in presets.items():
+        for screen, tabs in screens.items():
+            for tab, fields in tabs.items():
+                for field_name, data in fields.items():
+                    key = make_key(team, screen, tab, field_name)
+                    type_ = data.get("type", "css")
+                    if type_ == "css" and not data.get("selector"):
+                        index.problems.append(f"{key}: css field has no selector")
+                        continue
+                    if type_ == "table_lookup" and not data.get("table_id"):
+                        index.problems.append(f"{key}: table_lookup field has no table_id")
+                        continue
+                    index.records[key] = SelectorRecord(
+                        key=key,
+                        team=team,
+                        screen=screen,
+                        tab=tab,
+                        field=field_name,
+                        type=type_,
+                        selector=data.get("selector"),
+                        table_id=data.get("table_id"),
+                        label=data.get("label"),
+                        enabled=data.get("enabled", True),
+                    )
+
+    if workflows is not None:
+        index.check_workflows(workflows)
+
+    for problem in index.problems:
+        print(f"Selector index: {problem}")
+    return index
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.path.join(".cache", "templates")
+MAX_CACHE_BYTES = 512 * 1024 * 1024  # evict least recently used snapshots above this
+
+_lock = threading.Lock()
+
+
+def _file_hash(path, block_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _entry_paths(path, cache_dir):
+    key = hashlib.sha1(os.path.abspath(path).lower().encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key + ".npz"), os.path.join(cache_dir, key + ".json")
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp = f"{meta_path}.{os.getpid()}.tmp"  # workers may share the cache
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
+
+
+def _write_snapshot(snapshot_path, df):
+    """
+    Saves df as plain arrays (one string array plus a missing-value mask per
+    column) so a snapshot never needs unpickling, even if the cache directory
+    is shared. Raises TypeError when a header can't be stored as JSON.
+    """
+    arrays = {"columns": np.array(json.dumps(list(df.columns)))}
+    for i, col in enumerate(df.columns):
+        values = df.iloc[:, i]
+        missing = values.isna().to_numpy()
+        arrays[f"values_{i}"] = np.array(values.where(~missing, "").tolist(), dtype=str)
+        arrays[f"missing_{i}"] = missing
+    tmp = f"{snapshot_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, snapshot_path)
+
+
+def _read_snapshot(snapshot_path):
+    with np.load(snapshot_path, allow_pickle=False) as data:
+        columns = json.loads(str(data["columns"]))
+        series = {}
+        for i in range(len(columns)):
+            values = data[f"values_{i}"].astype(object)
+            values[data[f"missing_{i}"]] = np.nan
+            series[i] = values
+    df = pd.DataFrame(series, columns=range(len(columns)))
+    df.columns = columns
+    return df
+
+
+def _read_template(path):
+    return pd.read_excel(path, dtype=str)
+
+
+def load_template(path, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, reader=_read_template):
+    """
+    Returns the reference template as a DataFrame (dtype=str), from a .npz
+    snapshot when one is fresh. A snapshot is fresh when the file's mtime and
+    size match, or when they changed but the content hash did not (file was
+    only touched/copied). Otherwise the file is parsed again with `reader`
+    and the snapshot replaced.
+    """
+    st = os.stat(path)
+    snapshot_path, meta_path = _entry_paths(path, cache_dir)
+
+    with _lock:
+        meta = _read_meta(meta_path)
+        if meta and os.path.exists(snapshot_path):
+            fresh = meta["mtime_ns"] == st.st_mtime_ns and meta["size"] == st.st_size
+            if not fresh and meta["size"] == st.st_size and meta["sha256"] == _file_hash(path):
+                fresh = True
+                meta["mtime_ns"] = st.st_mtime_ns
+            if fresh:
+                try:
+                    df = _read_snapshot(snapshot_path)
+                    meta["last_used"] = time.time()
+                    _write_meta(meta_path, meta)
+                    return df
+                except Exception as e:
+                    print(f"Template cache: snapshot for {path} unreadable ({e}), re-parsing.")
+
+    df = reader(path)
+
+    with _lock:
+        os.makedirs(cache_dir, exist_ok=True)
+        try:
+            _write_snapshot(snapshot_path, df)
+        except TypeError as e:
+            print(f"Template cache: {path} not cached ({e}).")
+            return df
+        _write_meta(meta_path, {
+            "path": os.path.abspath(path),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": _file_hash(path),
+            "last_used": time.time(),
+        })
+        _evict(cache_dir, max_bytes, keep=snapshot_path)
+    return df
+
+
+def _evict(cache_dir, max_bytes, keep=None):
+    """Deletes least recently used snapshots until the cache fits in max_bytes."""
+    entries = []
+    total = 0
+    for name in os.listdir(cache_dir):
+        if name.endswith(".pkl"):  # snapshot from an older version, never read
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except FileNotFoundError:
+                pass
+            continue
+        if not name.endswith(".npz"):
+            continue
+        snapshot_path = os.path.join(cache_dir, name)
+        meta_path = snapshot_path[:-4] + ".json"
+        try:
+            size = os.path.getsize(snapshot_path)
+        except FileNotFoundError:  # evicted by another process
+            continue
+        meta = _read_meta(meta_path) or {}
+        entries.append((meta.get("last_used", 0), snapshot_path, meta_path, size))
+        total += size
+
+    for _, snapshot_path, meta_path, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if snapshot_path == keep:
+            continue
+        for p in (snapshot_path, meta_path):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+        total -= size
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    with _lock:
+        if not os.path.isdir(cache_dir):
+            return
+        for name in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, name))
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field, asdict
 from typing import List
 import json
+import os
 
 @dataclass
 class WorkflowStep:
@@ -38,8 +39,11 @@ class Workflow:
         )
 
     def save_to_file(self, path):
-        with open(path, "w", encoding="utf-8") as f:
+        # Temp file + rename so a crash or a concurrent reader never sees a torn file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
             json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp, path)
 
     @classmethod
     def load_from_file(cls, path):
@@ -0,0 +1,297 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from core.selector_index import make_key
+from core.workflow import Workflow
+
+# Resolves {name: css selector} in one round trip and returns
+# {name: {"ok": bool, "text"/"error": str, "missing": bool}}; text mirrors WebElement.text
+EXTRACT_ALL_JS = """
+const selectors = arguments[0];
+const out = {};
+for (const [name, sel] of Object.entries(selectors)) {
+    try {
+        const el = document.querySelector(sel);
+        if (el === null) {
+            out[name] = {ok: false, missing: true, error: "no such element: " + sel};
+        } else {
+            out[name] = {ok: true, text: (el.innerText || "").trim()};
+        }
+    } catch (e) {
+        out[name] = {ok: false, missing: false, error: String(e)};
+    }
+}
+return out;
+"""
+EXTRACT_WAIT_SECONDS = 10  # for the tab to render, same as wait_for steps
+EXTRACT_POLL_SECONDS = 0.25
+
+
+class ExtractionError(Exception):
+    """Some fields could not be extracted; `results` holds the ones that were, `errors` the rest."""
+
+    def __init__(self, results, errors):
+        self.results = results
+        self.errors = errors
+        super().__init__("Extraction failed for " + "; ".join(f"{name}: {error}" for name, error in errors.items()))
+
+
+def _implicit_wait(driver):
+    try:
+        return float(driver.timeouts.implicit_wait)
+    except Exception:
+        return 0.0
+
+
+def extract_all(driver, selectors, timeout=EXTRACT_WAIT_SECONDS):
+    """
+    Resolves every {name: css selector} with a single execute_script call.
+
+    document.querySelector doesn't get the driver's implicit wait, so missing
+    fields are looked up again (only those) until the tab has rendered - at
+    least one field present, for up to `timeout` seconds - and then for as
+    long as the implicit wait find_element would have given each of them.
+
+    Returns:
+        Tuple ({name: text} for every field found, {name: error} for the rest).
+    """
+    results = {}
+    errors = {}
+    pending = dict(selectors)
+    deadline = time.monotonic() + timeout
+    rendered_deadline = None
+    while True:
+        raw = driver.execute_script(EXTRACT_ALL_JS, pending) or {}
+        retry = {}
+        for name, selector in pending.items():
+            item = raw.get(name) or {"ok": False, "missing": True, "error": "no result returned"}
+            if item.get("ok"):
+                results[name] = item.get("text", "")
+            else:
+                errors[name] = item.get("error")
+                if item.get("missing"):
+                    retry[name] = selector
+        if not retry:
+            return results, errors
+        if results and rendered_deadline is None:
+            rendered_deadline = time.monotonic() + _implicit_wait(driver)
+        if time.monotonic() >= (rendered_deadline if rendered_deadline is not None else deadline):
+            return results, errors
+        for name in retry:
+            del errors[name]  # looked up again on the next pass
+        pending = retry
+        time.sleep(EXTRACT_POLL_SECONDS)
+
+
+class WorkflowCompileError(Exception):
+    """Raised when a workflow has invalid steps; `problems` lists every one of them."""
+
+    def __init__(self, name, problems):
+        self.problems = problems
+        super().__init__(f"Workflow '{name}' is invalid:\n" + "\n".join(problems))
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    action: str
+    key: Optional[str] = None  # full selector key, for error messages
+    selector: Optional[str] = None
+    value: Optional[str] = None  # literal input value
+    value_from: Optional[str] = None  # context column for input
+    as_name: Optional[str] = None  # result name for extract
+    seconds: float = 0
+    selectors: Dict[str, str] = field(default_factory=dict)  # extract_all: as_name -> selector
+    handler: Optional[Callable] = None
+
+
+def _switch_to_frame(driver, step, context, results):
+    driver.switch_to.frame(driver.find_element(By.CSS_SELECTOR, step.selector))
+
+def _click(driver, step, context, results):
+    driver.find_element(By.CSS_SELECTOR, step.selector).click()
+
+def _input(driver, step, context, results):
+    value = context.get(step.value_from, "") if step.value_from else step.value
+    el = driver.find_element(By.CSS_SELECTOR, step.selector)
+    el.clear()
+    el.send_keys(str(value))  # make sure value is string
+
+def _wait_for(driver, step, context, results):
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, step.selector))
+    )
+
+def _wait(driver, step, context, results):
+    time.sleep(step.seconds)
+
+def _extract(driver, step, context, results):
+    # Same lookup as a batched extract, so a late or missing field is
+    # waited for and reported the same way
+    found, errors = extract_all(driver, {step.as_name: step.selector})
+    results.update(found)
+    if errors:
+        raise ExtractionError(found, errors)
+    print(f"DEBUG: Extracted text for {step.key}: {found[step.as_name]}")
+
+def _extract_all(driver, step, context, results):
+    found, errors = extract_all(driver, step.selectors)
+    results.update(found)
+    if errors:
+        raise ExtractionError(found, errors)
+
+
+HANDLERS = {
+    "switch_to_frame": _switch_to_frame,
+    "click": _click,
+    "input": _input,
+    "wait_for": _wait_for,
+    "wait": _wait,
+    "extract": _extract,
+}
+# Actions that don't touch an element
+NO_SELECTOR_ACTIONS = {"wait"}
+
+
+@dataclass
+class CompiledWorkflow:
+    """Validated, pre-resolved plan that can be executed any number of times."""
+    name: str
+    steps: List[CompiledStep] = field(default_factory=list)
+
+    @property
+    def output_names(self):
+        """Result names the plan produces, in step order."""
+        names = []
+        for step in self.steps:
+            if step.action == "extract":
+                names.append(step.as_name)
+            elif step.action == "extract_all":
+                names.extend(step.selectors)
+        return names
+
+    def run(self, driver, context=None):
+        """
+        Runs every step and returns {as_name: text}. Fields an extract could
+        not find don't stop the run: the remaining steps still run and
+        an ExtractionError carrying the partial results is raised at the end.
+        """
+        context = context or {}
+        results = {}
+        errors = {}
+        for step in self.steps:
+            try:
+                step.handler(driver, step, context, results)
+            except ExtractionError as e:
+                errors.update(e.errors)
+        if errors:
+            raise ExtractionError(results, errors)
+        return results
+
+
+def _group_extracts(steps):
+    """Merges runs of consecutive extract steps into one extract_all step."""
+    grouped = []
+    run = []
+
+    def close_run():
+        if len(run) == 1:
+            grouped.append(run[0])
+        elif run:
+            grouped.append(CompiledStep(
+                action="extract_all",
+                selectors={s.as_name: s.selector for s in run},
+                handler=_extract_all,
+            ))
+        run.clear()
+
+    for step in steps:
+        if step.action == "extract":
+            run.append(step)
+        else:
+            close_run()
+            grouped.append(step)
+    close_run()
+    return grouped
+
+
+def _compile(name, raw_steps, index, batch_extract):
+    """raw_steps: (position, action, key, as_name, value, value_from, seconds)"""
+    problems = []
+    compiled = []
+    for pos, action, key, as_name, value, value_from, seconds in raw_steps:
+        prefix = f"Step {pos} ({action})"
+        handler = HANDLERS.get(action)
+        if handler is None:
+            problems.append(f"{prefix}: unknown action")
+            continue
+
+        selector = None
+        if action not in NO_SELECTOR_ACTIONS:
+            record = index.get(key) if key else None
+            if not key:
+                problems.append(f"{prefix}: no field given")
+            elif record is None:
+                problems.append(f"{prefix}: selector not found for {key}")
+            elif record.type != "css":
+                problems.append(f"{prefix}: {key} is a {record.type} field, a css selector is required")
+            else:
+                selector = record.selector
+
+        if action == "extract" and not as_name:
+            problems.append(f"{prefix}: extract step has no result name")
+        if action == "input" and value is None and not value_from:
+            problems.append(f"{prefix}: input step has no value or value_from")
+
+        compiled.append(CompiledStep(
+            action=action, key=key, selector=selector, value=value,
+            value_from=value_from, as_name=as_name, seconds=seconds, handler=handler,
+        ))
+
+    if problems:
+        raise WorkflowCompileError(name, problems)
+    if batch_extract:
+        compiled = _group_extracts(compiled)
+    return CompiledWorkflow(name=name, steps=compiled)
+
+
+def compile_steps(steps, index, team, screen, tab, name="Unnamed Workflow", batch_extract=False):
+    """
+    Compiles workflow.json-style steps ({action, field, as, value_from}) whose
+    fields live under presets[team][screen][tab].
+    With batch_extract=True consecutive extract steps become one script call.
+    """
+    raw = []
+    for pos, step in enumerate(steps, start=1):
+        field_name = step.get("field")
+        raw.append((
+            pos,
+            step.get("action"),
+            make_key(team, screen, tab, field_name) if field_name else None,
+            step.get("as"),
+            step.get("value"),
+            step.get("value_from"),
+            float(step.get("seconds", 0) or 0),
+        ))
+    return _compile(name, raw, index, batch_extract)
+
+
+def compile_workflow(workflow: Workflow, index, batch_extract=False):
+    """Compiles a core.workflow.Workflow whose steps carry full selector keys."""
+    raw = []
+    for pos, step in enumerate(workflow.steps, start=1):
+        record = index.get(step.selector_key)
+        raw.append((
+            pos,
+            step.action,
+            step.selector_key,
+            step.params.get("as") or (record.field if record else step.selector_key),
+            step.params.get("value"),
+            step.params.get("value_from"),
+            float(step.params.get("seconds", 0) or 0),
+        ))
+    return _compile(workflow.name, raw, index, batch_extract)
@@ -1,9 +1,11 @@
 import sys
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QIcon
 from gui.main_gui import MainGUIWithSidebar  # Import the Main GUI class
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # needed for process pools in the PyInstaller build
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon("scb-logo.ico"))  # Set the application icon
     driver_path = "msedgedriver.exe"  # Path to the WebDriver executable
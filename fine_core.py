@@ -1,8 +1,9 @@
 import time
 from selenium import webdriver
 from selenium.webdriver.edge.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
 
-def run_browser_automation(driver_path):
+def run_browser_automation(driver_path, window_timeout=60, poll_interval=0.05):
     service = Service(executable_path=driver_path)
     driver = webdriver.Edge(service=service)
 
@@ -14,11 +15,12 @@ def run_browser_automation(driver_path):
 
         time.sleep(2)
         original_window = driver.current_window_handle
-        new_window = None
-        while new_window is None:
-            time.sleep(1)
-            if len(driver.window_handles) > 1:
-                new_window = [w for w in driver.window_handles if w != original_window][0]
+        started = time.perf_counter()
+        # Raises TimeoutException instead of waiting forever
+        new_window = WebDriverWait(driver, window_timeout, poll_frequency=poll_interval).until(
+            lambda d: next((w for w in d.window_handles if w != original_window), False)
+        )
+        print(f"New window appeared after {time.perf_counter() - started:.3f}s.")
 
         driver.switch_to.window(new_window)
         print(f"New window title: {driver.title}")
@@ -0,0 +1,164 @@
+# gui/jobs.py
+# Runs long jobs (comparison, letter generation, ...) on QThreadPool so the
+# window stays responsive. A job function gets a JobContext as its first
+# argument; it reports progress through context.report(done, total) (or by
+# passing context.report as an on_progress callback) and stops cooperatively:
+# once cancel() is requested the next report()/check_cancelled() raises
+# JobCancelled.
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QPushButton
+
+
+class JobCancelled(Exception):
+    pass
+
+
+@dataclass
+class JobProgress:
+    done: int
+    total: Optional[int]  # None when the total is not known up front
+    elapsed: float
+    message: str = ""
+
+    @property
+    def rows_per_sec(self):
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self):
+        if not self.total or not self.done:
+            return None
+        return max(self.total - self.done, 0) / self.rows_per_sec
+
+    def text(self):
+        parts = [f"{self.done}/{self.total}" if self.total else f"{self.done}", f"{self.rows_per_sec:.1f} rows/s"]
+        eta = self.eta_seconds
+        if eta is not None and self.done < self.total:
+            parts.append(f"ETA {int(eta // 60)}:{int(eta % 60):02d}")
+        if self.message:
+            parts.append(self.message)
+        return " - ".join(parts)
+
+
+class JobSignals(QObject):
+    progress = Signal(object)   # JobProgress
+    finished = Signal(object)   # return value of the job function
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class JobContext:
+    def __init__(self, signals, min_interval=0.1):
+        self._signals = signals
+        self._min_interval = min_interval  # don't flood the GUI thread with updates
+        self._cancel_requested = False
+        self._started = time.perf_counter()
+        self._last_emit = 0.0
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_requested
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def check_cancelled(self):
+        if self._cancel_requested:
+            raise JobCancelled()
+
+    def report(self, done, total=None, *extra, message=""):
+        """on_progress-compatible: extra positional arguments (per-chunk results) are ignored."""
+        self.check_cancelled()
+        now = time.perf_counter()
+        if now - self._last_emit >= self._min_interval or (total and done >= total):
+            self._last_emit = now
+            self._signals.progress.emit(JobProgress(done, total, now - self._started, message))
+
+
+class Job(QRunnable):
+    """fn(context, *args, **kwargs) run on a pool thread; connect to job.signals before start()."""
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self.context = JobContext(self.signals)
+
+    def cancel(self):
+        self.context.cancel()
+
+    def run(self):
+        try:
+            result = self.fn(self.context, *self.args, **self.kwargs)
+        except Exception as e:
+            # core functions may wrap JobCancelled in their own error type
+            if self.context.cancel_requested:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+    def start(self, pool=None):
+        (pool or QThreadPool.globalInstance()).start(self)
+        return self
+
+
+class JobProgressPanel(QWidget):
+    """Progress bar, rate/ETA label and Cancel button for one running job at a time."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.job = None
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.bar = QProgressBar()
+        self.label = QLabel("")
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel)
+        layout.addWidget(self.bar, 1)
+        layout.addWidget(self.label)
+        layout.addWidget(self.cancel_button)
+        self.setVisible(False)
+
+    @property
+    def busy(self):
+        return self.job is not None
+
+    def run(self, job, on_finished, on_failed=None, on_cancelled=None):
+        """Starts the job and routes its outcome to the callbacks (called on the GUI thread)."""
+        self.job = job
+        self.bar.setRange(0, 0)  # busy indicator until the first report
+        self.label.setText("Starting...")
+        self.cancel_button.setEnabled(True)
+        self.setVisible(True)
+
+        job.signals.progress.connect(self.show_progress)
+        job.signals.finished.connect(lambda result: self._done(on_finished, result))
+        job.signals.failed.connect(lambda error: self._done(on_failed, error))
+        job.signals.cancelled.connect(lambda: self._done(on_cancelled))
+        job.start()
+
+    def show_progress(self, progress):
+        if progress.total:
+            self.bar.setRange(0, progress.total)
+            self.bar.setValue(progress.done)
+        self.label.setText(progress.text())
+
+    def cancel(self):
+        if self.job:
+            self.job.cancel()
+            self.cancel_button.setEnabled(False)
+            self.label.setText("Cancelling...")
+
+    def _done(self, callback, *args):
+        self.job = None
+        self.setVisible(False)
+        if callback:
+            callback(*args)
@@ -2,34 +2,49 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget, QPushButton, QFrame, QLabel
 from PySide6.QtGui import QPixmap
 from PySide6.QtCore import Qt
-from gui.screens.scraping_screen import ScrapingScreen
-from gui.screens.comparing_screen import ComparingScreen
-from gui.screens.mail_screen import MailGenerationScreen
-from gui.workflow_manager import WorkflowManager
-from gui.preset_manager import PresetManager
 from core import presets
 
 
+def _scraping_screen(window):
+    from gui.screens.scraping_screen import ScrapingScreen
+    return ScrapingScreen(window.driver_path)
+
+def _comparing_screen(window):
+    from gui.screens.comparing_screen import ComparingScreen
+    return ComparingScreen()
+
+def _mail_screen(window):
+    from gui.screens.mail_screen import MailGenerationScreen
+    return MailGenerationScreen()
+
+def _preset_manager(window):
+    from gui.preset_manager import PresetManager
+    return PresetManager()
+
+def _workflow_manager(window):
+    from gui.workflow_manager import WorkflowManager
+    return WorkflowManager()
+
+
+# Screens are built (and their modules imported) on first navigation
+SCREEN_FACTORIES = {
+    "scraping_screen": _scraping_screen,
+    "comparing_screen": _comparing_screen,
+    "mail_screen": _mail_screen,
+    "preset_manager": _preset_manager,
+    "workflow_manager": _workflow_manager,
+}
+
+
 class MainGUIWithSidebar(QWidget):
     def __init__(self, driver_path):
         super().__init__()
         self.setWindowTitle("Universal Enquiry Scraping")
         self.setFixedSize(1000, 600)
 
+        self.driver_path = driver_path
         self.stack = QStackedWidget()
-
-        # Screens
-        self.scraping_screen = ScrapingScreen(driver_path)
-        self.comparing_screen = ComparingScreen()
-        self.mail_screen = MailGenerationScreen()
-        self.preset_manager = PresetManager()
-        self.workflow_manager = WorkflowManager()
-
-        self.stack.addWidget(self.scraping_screen)
-        self.stack.addWidget(self.comparing_screen)
-        self.stack.addWidget(self.mail_screen)     # index 0
-        self.stack.addWidget(self.preset_manager)      # index 1
-        self.stack.addWidget(self.workflow_manager)    # index 2
+        self.screens = {}
 
         # Sidebar menu
         sidebar = QVBoxLayout()
@@ -47,24 +62,24 @@ class MainGUIWithSidebar(QWidget):
         sidebar.addWidget(logo_label)
         
         btn_scrape = QPushButton("🔍 Scraping")
-        btn_scrape.clicked.connect(lambda: self.stack.setCurrentWidget(self.scraping_screen))
+        btn_scrape.clicked.connect(lambda: self.show_screen("scraping_screen"))
         sidebar.addWidget(btn_scrape)
 
         btn_compare = QPushButton("🔍 Comparing")
-        btn_compare.clicked.connect(lambda: self.stack.setCurrentWidget(self.comparing_screen))
+        btn_compare.clicked.connect(lambda: self.show_screen("comparing_screen"))
         sidebar.addWidget(btn_compare)
 
         btn_mail = QPushButton("🔍 Letter Generation")
-        btn_mail.clicked.connect(lambda: self.stack.setCurrentWidget(self.mail_screen))
+        btn_mail.clicked.connect(lambda: self.show_screen("mail_screen"))
         sidebar.addWidget(btn_mail)
         sidebar.addStretch()
         
         btn_presets = QPushButton("🛠️ Manage Presets")
-        btn_presets.clicked.connect(lambda: self.stack.setCurrentWidget(self.preset_manager))
+        btn_presets.clicked.connect(lambda: self.show_screen("preset_manager"))
         sidebar.addWidget(btn_presets)
 
         btn_workflow = QPushButton("🧩 Workflow Manager")
-        btn_workflow.clicked.connect(lambda: self.stack.setCurrentWidget(self.workflow_manager))
+        btn_workflow.clicked.connect(lambda: self.show_screen("workflow_manager"))
         sidebar.addWidget(btn_workflow)
 
 
@@ -78,12 +93,28 @@ class MainGUIWithSidebar(QWidget):
         layout.addWidget(sidebar_frame)
         layout.addWidget(vline)
         layout.addWidget(self.stack)
-    
+
+        self.show_screen("scraping_screen")
+
+    def screen(self, name):
+        """Returns the screen, building it the first time it is needed."""
+        if name not in self.screens:
+            widget = SCREEN_FACTORIES[name](self)
+            self.screens[name] = widget
+            self.stack.addWidget(widget)
+        return self.screens[name]
+
+    def show_screen(self, name):
+        self.stack.setCurrentWidget(self.screen(name))
+
     def open_preset_manager(self):
+        from gui.preset_manager import PresetManager
         dlg = PresetManager(self)
         dlg.exec()
 
         # Optional: refresh scraping screen team combo if necessary
-        self.scraping_screen.team_combo.clear()
-        self.scraping_screen.team_combo.addItems(presets.get_team_names())
+        if "scraping_screen" in self.screens:
+            scraping_screen = self.screens["scraping_screen"]
+            scraping_screen.team_combo.clear()
+            scraping_screen.team_combo.addItems(presets.get_team_names())
 
@@ -1,13 +1,16 @@
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
     QMessageBox, QComboBox, QFormLayout, QDialogButtonBox,
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,QTreeWidget, QTreeWidgetItem,QTabWidget
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QTreeView, QTabWidget
 )
 
 
 
-from core import presets  # Import the presets module for managing preset data
+from core.preset_store import PresetStore, UPDATE, REMOVE
+from gui.preset_tree_model import PresetTreeModel
+
+SAVE_DELAY_MS = 500  # edits within this window are written to presets.json once
 
 # Preset Manager Dialog
 class PresetManager(QDialog):
@@ -16,12 +19,20 @@ class PresetManager(QDialog):
         self.setWindowTitle("Manage Presets")
         self.setFixedSize(800, 500)
 
-        # Tree widget for Team > Screen > Tab
-        self.preset_tree = QTreeWidget()
-        self.preset_tree.setHeaderLabels(["Team / Screen / Tab"])
-        self.preset_tree.setColumnCount(1)
-
-        self.load_presets()
+        # Tree view for Team > Screen > Tab, backed by an in-memory store
+        self.store = PresetStore()
+        self.tree_model = PresetTreeModel(self.store, self)
+        self.preset_tree = QTreeView()
+        self.preset_tree.setModel(self.tree_model)
+        self.preset_tree.setUniformRowHeights(True)
+
+        # Debounced save: every edit restarts the timer
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.store.save)
+        self.store.add_listener(self.on_store_change)
+        self.shown_path = None  # tab whose fields are in the table
 
         # Buttons
         self.add_button = QPushButton("Add Preset")
@@ -49,35 +60,48 @@ class PresetManager(QDialog):
         self.setLayout(layout)
 
         # Connections
-        self.preset_tree.itemClicked.connect(self.on_tree_item_clicked)
+        self.preset_tree.clicked.connect(self.on_tree_item_clicked)
         self.add_button.clicked.connect(self.add_preset)
         self.edit_button.clicked.connect(self.edit_preset)
         self.delete_button.clicked.connect(self.delete_preset)
 
     def load_presets(self):
-        self.preset_tree.clear()
-        all_presets = presets.load_presets()
-
-        for team, screens in all_presets.items():
-            team_item = QTreeWidgetItem([team])
-            for screen, tabs in screens.items():
-                screen_item = QTreeWidgetItem([screen])
-                for tab in tabs:
-                    tab_item = QTreeWidgetItem([tab])
-                    screen_item.addChild(tab_item)
-                team_item.addChild(screen_item)
-            self.preset_tree.addTopLevelItem(team_item)
-
-    def on_tree_item_clicked(self, item):
+        """Re-reads presets.json (pending edits are saved first)."""
+        self.flush_saves()
+        self.store.reload()
+        self.tree_model.reset()
+        self.shown_path = None
+        self.fields_table.setRowCount(0)
+
+    def flush_saves(self):
+        self.save_timer.stop()
+        self.store.save()
+
+    def hideEvent(self, event):
+        self.flush_saves()
+        super().hideEvent(event)
+
+    def on_store_change(self, kind, path):
+        self.save_timer.start()
+        if self.shown_path is None:
+            return
+        if kind == UPDATE and path == self.shown_path:
+            self.populate_fields_table(self.store.get_fields(*path))
+        elif kind == REMOVE and self.shown_path[:len(path)] == path:
+            self.shown_path = None
+            self.fields_table.setRowCount(0)
+
+    def selected_path(self):
+        return self.tree_model.path(self.preset_tree.currentIndex())
+
+    def on_tree_item_clicked(self, index):
         """When user selects a tab node, load its fields."""
-        if not item.parent() or not item.parent().parent():
+        path = self.tree_model.path(index)
+        if len(path) != 3:
             return  # Only proceed if it's a tab level node
 
-        tab = item.text(0)
-        screen = item.parent().text(0)
-        team = item.parent().parent().text(0)
-
-        fields = presets.get_fields(team, screen, tab)
+        self.shown_path = path
+        fields = self.store.get_fields(*path)
         self.populate_fields_table(fields)
 
     def populate_fields_table(self, fields):
@@ -114,54 +138,36 @@ class PresetManager(QDialog):
             screen = data["screen"]
             tab_fields = data["fields"]  # {tab_name: field_dict}
 
-            all_presets = presets.load_presets()
-
-            if team not in all_presets:
-                all_presets[team] = {}
-            if screen not in all_presets[team]:
-                all_presets[team][screen] = {}
-
+            existing_tabs = self.store.children((team, screen))
             duplicate_tabs = []
             for tab, fields in tab_fields.items():
-                if tab in all_presets[team][screen]:
+                if tab in existing_tabs:
                     duplicate_tabs.append(tab)
                 else:
-                    all_presets[team][screen][tab] = fields
+                    self.store.set_tab(team, screen, tab, fields)
 
             if duplicate_tabs:
                 QMessageBox.warning(self, "Duplicate Tabs",
                                     f"The following tabs already exist and were skipped: {', '.join(duplicate_tabs)}")
 
-            presets.save_presets(all_presets)
-            self.load_presets()
             QMessageBox.information(self, "Success", f"Preset(s) added to {team} > {screen}")
 
 
 
     
     def edit_preset(self):
-        item = self.preset_tree.currentItem()
-        if not item:
+        path = self.selected_path()
+        if not path:
             QMessageBox.warning(self, "Selection Error", "Please select a team, screen, or tab.")
             return
 
-        # Determine what level was clicked
-        if item.parent() and item.parent().parent():
-            # Tab level
-            tab = item.text(0)
-            screen = item.parent().text(0)
-            team = item.parent().parent().text(0)
-        elif item.parent():
-            # Screen level
-            tab = None
-            screen = item.text(0)
-            team = item.parent().text(0)
-        else:
+        # Determine what level was clicked (tab or screen level edits the whole screen)
+        if len(path) == 1:
             QMessageBox.warning(self, "Selection Error", "Please select at least a screen under a team.")
             return
+        team, screen = path[0], path[1]
 
-        all_presets = presets.load_presets()
-        existing_tabs = all_presets.get(team, {}).get(screen, {})
+        existing_tabs = {tab: self.store.get_fields(team, screen, tab) for tab in self.store.children((team, screen))}
 
         if not existing_tabs:
             QMessageBox.warning(self, "Not Found", f"No tabs found under {team} > {screen}")
@@ -206,16 +212,28 @@ class PresetManager(QDialog):
                 return
 
             new_tabs = data["fields"]
-            all_presets[team][screen] = new_tabs
-            presets.save_presets(all_presets)
+            self.store.set_screen(team, screen, new_tabs)
 
-            self.load_presets()
             QMessageBox.information(self, "Success", f"Preset updated for {team} > {screen}")
 
 
         
     def delete_preset(self):
-        QMessageBox.information(self, "Not Implemented", "Deleting presets will be implemented next.")
+        path = self.selected_path()
+        if not path:
+            QMessageBox.warning(self, "Selection Error", "Please select a team, screen, or tab.")
+            return
+
+        answer = QMessageBox.question(self, "Delete Preset", f"Delete {' > '.join(path)} and everything under it?")
+        if answer != QMessageBox.Yes:
+            return
+
+        if len(path) == 3:
+            self.store.delete_tab(*path)
+        elif len(path) == 2:
+            self.store.delete_screen(*path)
+        else:
+            self.store.delete_team(*path)
 
 # Preset Form for adding/editing presets
 class PresetForm(QDialog):
@@ -0,0 +1,178 @@
+# gui/preset_tree_model.py
+# Team > Screen > Tab tree over a core.preset_store.PresetStore. Children are
+# only materialised when a node is expanded (fetchMore), and store edits are
+# applied as row inserts/removes instead of rebuilding the whole tree.
+from PySide6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+from core.preset_store import INSERT, REMOVE, UPDATE
+
+TAB_LEVEL = 3
+
+
+class _Node:
+    __slots__ = ("name", "parent", "level", "children")
+
+    def __init__(self, name, parent, level):
+        self.name = name
+        self.parent = parent
+        self.level = level  # 0 root, 1 team, 2 screen, 3 tab
+        self.children = None  # None until fetched
+
+    def path(self):
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return tuple(reversed(names))
+
+    def row(self):
+        return self.parent.children.index(self)
+
+
+class PresetTreeModel(QAbstractItemModel):
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.root = _Node(None, None, 0)
+        self._load_children(self.root)
+        self._changing = False  # no lazy fetches while a change is being signalled
+        store.add_listener(self._on_store_change)
+
+    def reset(self):
+        """Rebuilds from the store (after PresetStore.reload())."""
+        self._changing = True
+        self.beginResetModel()
+        self.root = _Node(None, None, 0)
+        self._load_children(self.root)
+        self.endResetModel()
+        self._changing = False
+
+    def _load_children(self, node):
+        node.children = [_Node(name, node, node.level + 1) for name in self.store.children(node.path())]
+
+    def _load_subtree(self, node):
+        if node.level < TAB_LEVEL:
+            self._load_children(node)
+            for child in node.children:
+                self._load_subtree(child)
+
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def _index_of(self, node):
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row(), 0, node)
+
+    def _find(self, path):
+        """Loaded node for path, or None when it (or a parent) hasn't been fetched."""
+        node = self.root
+        for name in path:
+            if node.children is None:
+                return None
+            node = next((child for child in node.children if child.name == name), None)
+            if node is None:
+                return None
+        return node
+
+    def path(self, index):
+        """(team,), (team, screen) or (team, screen, tab) for an index."""
+        return self._node(index).path()
+
+    def index_for_path(self, path):
+        node = self.root
+        for name in path:
+            if node.children is None:
+                self.fetchMore(self._index_of(node))
+            node = next((child for child in node.children if child.name == name), None)
+            if node is None:
+                return QModelIndex()
+        return self._index_of(node)
+
+    # --- QAbstractItemModel ---
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self._node(parent)
+        if column != 0 or node.children is None or not 0 <= row < len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        node = self._node(parent)
+        return len(node.children) if node.children is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        if node.level >= TAB_LEVEL:
+            return False
+        if node.children is not None:
+            return bool(node.children)
+        return True  # teams/screens are never stored empty
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return node.children is None and node.level < TAB_LEVEL and not self._changing
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if node.children is not None or self._changing:
+            return
+        names = self.store.children(node.path())
+        node.children = []
+        if names:
+            self._changing = True
+            self.beginInsertRows(parent, 0, len(names) - 1)
+            node.children.extend(_Node(name, node, node.level + 1) for name in names)
+            self.endInsertRows()
+            self._changing = False
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole:
+            return index.internalPointer().name
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return "Team / Screen / Tab"
+        return None
+
+    # --- store changes ---
+
+    def _on_store_change(self, kind, path):
+        if kind == INSERT:
+            parent = self._find(path[:-1])
+            if parent is None or parent.children is None:
+                return  # not expanded yet: picked up by fetchMore
+            # A new subtree is small: build it fully rather than lazily
+            node = _Node(path[-1], parent, parent.level + 1)
+            self._load_subtree(node)
+            row = len(parent.children)
+            self._changing = True
+            self.beginInsertRows(self._index_of(parent), row, row)
+            parent.children.append(node)
+            self.endInsertRows()
+            self._changing = False
+        elif kind == REMOVE:
+            node = self._find(path)
+            if node is None:
+                return
+            row = node.row()
+            self._changing = True
+            self.beginRemoveRows(self._index_of(node.parent), row, row)
+            del node.parent.children[row]
+            self.endRemoveRows()
+            self._changing = False
+        elif kind == UPDATE:
+            node = self._find(path)
+            if node is not None:
+                index = self._index_of(node)
+                self.dataChanged.emit(index, index)
@@ -0,0 +1,143 @@
+# gui/result_view.py
+# Table view of a comparison result DataFrame. QTableView only asks the model
+# for the visible cells, so 100k+ rows open instantly; filters just swap the
+# array of visible row positions.
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTableView
+
+ALL = "All"
+STATUS_COLORS = {
+    "MISMATCH": QColor("#f8d7da"),
+    "MISSING": QColor("#fff3cd"),
+    "UNEXPECTED": QColor("#fff3cd"),
+    "DUPLICATE": QColor("#fff3cd"),
+}
+CELL_MISMATCH_COLOR = QColor("#f1a7ae")
+
+
+class ComparisonResultModel(QAbstractTableModel):
+    def __init__(self, result_df=None, differences=None, parent=None):
+        super().__init__(parent)
+        self.set_result(result_df if result_df is not None else pd.DataFrame(columns=["STATUS", "STATUSMSG"]),
+                        differences)
+
+    def set_result(self, result_df, differences=None):
+        """
+        differences: per-column bool mismatch masks aligned with result_df rows,
+        as returned by compare_excel_files_frame; these columns are counted and
+        highlighted. None = no per-column highlighting.
+        """
+        self.beginResetModel()
+        self.columns = list(result_df.columns)
+        # Plain object arrays: data() is called per visible cell and must be cheap
+        self._values = [result_df[c].to_numpy(dtype=object) for c in self.columns]
+        self._status = result_df["STATUS"].fillna("").to_numpy(dtype=object)
+        if differences is None:
+            differences = pd.DataFrame(index=result_df.index)
+        self.compare_columns = list(differences.columns)
+        self.masks = {c: differences[c].to_numpy(dtype=bool) for c in self.compare_columns}
+        self.mismatch_counts = {c: int(m.sum()) for c, m in self.masks.items()}
+        self.status_counts = pd.Series(self._status).value_counts().to_dict()
+        self._rows = np.arange(len(result_df))
+        self.endResetModel()
+
+    def set_filter(self, status=ALL, column=ALL):
+        keep = np.ones(len(self._status), dtype=bool)
+        if status != ALL:
+            keep &= self._status == status
+        if column != ALL:
+            keep &= self.masks[column]
+        self.beginResetModel()
+        self._rows = np.flatnonzero(keep)
+        self.endResetModel()
+
+    def source_row(self, row):
+        return int(self._rows[row])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        col = index.column()
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            value = self._values[col][row]
+            return "" if pd.isna(value) else str(value)
+        if role == Qt.BackgroundRole:
+            mask = self.masks.get(self.columns[col])
+            if mask is not None and mask[row]:
+                return CELL_MISMATCH_COLOR
+            return STATUS_COLORS.get(self._status[row])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            name = self.columns[section]
+            count = self.mismatch_counts.get(name)
+            return f"{name} ({count})" if count else name
+        return str(self.source_row(section) + 1)
+
+
+class ComparisonResultView(QWidget):
+    """Filter bar + summary + virtualized table for a comparison result."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        filters = QHBoxLayout()
+        filters.addWidget(QLabel("Status:"))
+        self.status_filter = QComboBox()
+        self.status_filter.currentIndexChanged.connect(self.apply_filter)
+        filters.addWidget(self.status_filter)
+        filters.addWidget(QLabel("Column:"))
+        self.column_filter = QComboBox()
+        self.column_filter.currentIndexChanged.connect(self.apply_filter)
+        filters.addWidget(self.column_filter, 1)
+        layout.addLayout(filters)
+
+        self.summary = QLabel("")
+        layout.addWidget(self.summary)
+
+        self.model = ComparisonResultModel(parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        layout.addWidget(self.table)
+
+    def set_result(self, result_df, differences=None):
+        self.model.set_result(result_df, differences)
+
+        for combo in (self.status_filter, self.column_filter):
+            combo.blockSignals(True)
+            combo.clear()
+        self.status_filter.addItem(ALL, ALL)
+        for status, count in sorted(self.model.status_counts.items()):
+            self.status_filter.addItem(f"{status} ({count})", status)
+        if "MISMATCH" in self.model.status_counts:
+            self.status_filter.setCurrentIndex(self.status_filter.findData("MISMATCH"))
+        self.column_filter.addItem(ALL, ALL)
+        for col, count in sorted(self.model.mismatch_counts.items(), key=lambda item: -item[1]):
+            if count:
+                self.column_filter.addItem(f"{col} ({count} mismatches)", col)
+        for combo in (self.status_filter, self.column_filter):
+            combo.blockSignals(False)
+
+        self.summary.setText(", ".join(f"{k}: {v}" for k, v in sorted(self.model.status_counts.items())))
+        self.apply_filter()
+
+    def apply_filter(self):
+        self.model.set_filter(self.status_filter.currentData() or ALL, self.column_filter.currentData() or ALL)
+        if self.model.rowCount() < 1000:  # measures every row, too slow for big results
+            self.table.resizeColumnsToContents()
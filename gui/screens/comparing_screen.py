@@ -1,5 +1,5 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QFileDialog, QTextEdit, QMessageBox
-from core.comparer import compare_excel_files
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QFileDialog, QTextEdit, QMessageBox, QLineEdit, QCheckBox
+from gui.jobs import Job, JobProgressPanel
 import os
 
 class ComparingScreen(QWidget):
@@ -18,15 +18,37 @@ class ComparingScreen(QWidget):
         self.btn_load_file2.clicked.connect(self.load_file2)
         self.layout().addWidget(self.btn_load_file2)
 
+        self.key_columns_input = QLineEdit()
+        self.key_columns_input.setPlaceholderText("Key column(s), comma-separated (optional, e.g. Rel ID) - empty compares by row position")
+        self.layout().addWidget(self.key_columns_input)
+
+        self.streaming_checkbox = QCheckBox("Large file mode (compare in chunks, save to <target>_result)")
+        self.layout().addWidget(self.streaming_checkbox)
+
+        self.incremental_checkbox = QCheckBox("Only re-check rows changed since the last run")
+        self.layout().addWidget(self.incremental_checkbox)
+
         self.compare_button = QPushButton("Compare Files")
         self.compare_button.clicked.connect(self.compare_files)
         self.compare_button.setEnabled(False)
         self.layout().addWidget(self.compare_button)
 
+        self.compare_folders_button = QPushButton("Compare Folders (batch)...")
+        self.compare_folders_button.setToolTip("Pair every file in a target folder with its reference template by name and compare them all")
+        self.compare_folders_button.clicked.connect(self.compare_folders)
+        self.layout().addWidget(self.compare_folders_button)
+
+        self.progress_panel = JobProgressPanel()
+        self.layout().addWidget(self.progress_panel)
+
         self.result_area = QTextEdit()
         self.result_area.setReadOnly(True)
         self.layout().addWidget(self.result_area)
 
+        # Row-level results of a single-file comparison, replaces the text log;
+        # built with the first result (pulls in pandas)
+        self.result_view = None
+
         self.file1_path = None
         self.file2_path = None
 
@@ -45,12 +67,111 @@ class ComparingScreen(QWidget):
             self.check_ready()
 
     def check_ready(self):
-        self.compare_button.setEnabled(bool(self.file1_path and self.file2_path))
+        busy = self.progress_panel.busy
+        self.compare_button.setEnabled(bool(self.file1_path and self.file2_path) and not busy)
+        self.compare_folders_button.setEnabled(not busy)
+
+    def run_job(self, job, on_finished, cancel_message):
+        """
+        Runs a comparison off the GUI thread; buttons stay disabled until it ends.
+        cancel_message() describes what was (or wasn't) written when the job is cancelled.
+        """
+        def finished(result):
+            self.check_ready()
+            on_finished(result)
+
+        def failed(error):
+            self.check_ready()
+            QMessageBox.critical(self, "Error", error)
+
+        def cancelled():
+            self.check_ready()
+            self.result_area.setText(f"⚠️ {cancel_message()}")
+
+        if self.result_view:
+            self.result_view.setVisible(False)
+        self.result_area.setVisible(True)
+        self.result_area.setText("⏳ Comparing...")
+        self.progress_panel.run(job, finished, failed, cancelled)
+        self.check_ready()
+
+    def compare_folders(self):
+        reference_dir = QFileDialog.getExistingDirectory(self, "Select Reference Templates Folder")
+        if not reference_dir:
+            return
+        target_dir = QFileDialog.getExistingDirectory(self, "Select Scraped Files Folder")
+        if not target_dir:
+            return
+        from core.batch_comparer import compare_directory
+        key_columns = [k.strip() for k in self.key_columns_input.text().split(",") if k.strip()]
+        incremental = self.incremental_checkbox.isChecked()
+        progress = {"done": 0, "total": 0}
+
+        def work(context):
+            def on_file_done(done, total, result):
+                progress.update(done=done, total=total)
+                context.report(done, total, result)
+
+            return compare_directory(
+                reference_dir, target_dir, on_file_done=on_file_done,
+                key_columns=key_columns or None, incremental=incremental
+            )
+
+        def finished(result):
+            summary_path, results = result
+            lines = [f"{r['TARGET']}: {r['RESULT']} - {r.get('MESSAGE', '')}" for r in results]
+            self.result_area.setText(f"✅ Batch comparison completed ({len(results)} files).\n\n" + "\n".join(lines))
+            QMessageBox.information(self, "Success", f"Summary saved to:\n{summary_path}")
+
+        def cancel_message():
+            return (f"Batch comparison cancelled. {progress['done']} of {progress['total']} files had "
+                    f"already been compared and their result files written; files already in progress "
+                    f"were allowed to finish. No summary workbook was written.")
+
+        self.run_job(Job(work), finished, cancel_message)
+
+    def get_result_view(self):
+        if self.result_view is None:
+            from gui.result_view import ComparisonResultView
+            self.result_view = ComparisonResultView()
+            self.layout().addWidget(self.result_view)
+        return self.result_view
 
     def compare_files(self):
-        try:
-            output_path, log_text = compare_excel_files(self.file1_path, self.file2_path)
-            self.result_area.setText(f"✅ Comparison completed.\n\n{log_text}")
+        from core.comparer import compare_excel_files_frame, compare_excel_files_streaming
+        key_columns = [k.strip() for k in self.key_columns_input.text().split(",") if k.strip()]
+        reference_path, target_path = self.file1_path, self.file2_path
+        incremental = self.incremental_checkbox.isChecked()
+        if self.streaming_checkbox.isChecked():
+            if key_columns:
+                QMessageBox.warning(self, "Not Supported", "Large file mode compares by row position; key columns are ignored.")
+            job = Job(lambda context: compare_excel_files_streaming(
+                reference_path, target_path, on_progress=context.report
+            ))
+        else:
+            job = Job(lambda context: compare_excel_files_frame(
+                reference_path, target_path, key_columns=key_columns or None,
+                incremental=incremental, on_progress=context.report
+            ))
+
+        def finished(result):
+            if len(result) == 2:  # streaming: capped text log
+                output_path, log_text = result
+                self.result_area.setText(f"✅ Comparison completed.\n\n{log_text}")
+            else:
+                output_path, result_df, summary_lines, differences = result
+                view = self.get_result_view()
+                view.set_result(result_df, differences)
+                view.summary.setText(
+                    "✅ Comparison completed. " + " | ".join(summary_lines + [view.summary.text()])
+                )
+                self.result_area.setVisible(False)
+                view.setVisible(True)
             QMessageBox.information(self, "Success", f"Comparison result saved to:\n{output_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+
+        if self.streaming_checkbox.isChecked():
+            # the streaming writer is aborted, leaving any earlier result in place
+            cancel_message = "Comparison cancelled. The previous result file was left unchanged."
+        else:
+            cancel_message = "Comparison cancelled before the result was saved. The target file was not changed."
+        self.run_job(job, finished, lambda: cancel_message)
@@ -2,10 +2,10 @@
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton,
-    QFileDialog, QMessageBox, QTextEdit
+    QFileDialog, QMessageBox, QTextEdit, QCheckBox, QSpinBox, QHBoxLayout
 )
 import os
-from core.mailer import generate_letters_from_excel  # ✅ ini sudah benar
+from gui.jobs import Job, JobProgressPanel
 
 class MailGenerationScreen(QWidget):
     def __init__(self):
@@ -31,11 +31,29 @@ class MailGenerationScreen(QWidget):
         self.btn_select_output.clicked.connect(self.select_output_dir)
         self.layout().addWidget(self.btn_select_output)
 
+        self.parallel_checkbox = QCheckBox("Use all CPU cores (parallel generation)")
+        self.layout().addWidget(self.parallel_checkbox)
+
+        merge_row = QHBoxLayout()
+        self.merge_checkbox = QCheckBox("Merge letters into one document")
+        self.merge_checkbox.toggled.connect(lambda on: self.letters_per_file.setEnabled(on))
+        merge_row.addWidget(self.merge_checkbox)
+        merge_row.addWidget(QLabel("Letters per file (0 = all in one file, uses more memory):"))
+        self.letters_per_file = QSpinBox()
+        self.letters_per_file.setRange(0, 100000)
+        self.letters_per_file.setValue(200)  # core.mailer.MERGED_LETTERS_PER_FILE; keeps memory bounded
+        self.letters_per_file.setEnabled(False)
+        merge_row.addWidget(self.letters_per_file)
+        self.layout().addLayout(merge_row)
+
         self.btn_generate = QPushButton("Generate Letters")
         self.btn_generate.clicked.connect(self.generate_letters)
         self.btn_generate.setEnabled(False)
         self.layout().addWidget(self.btn_generate)
 
+        self.progress_panel = JobProgressPanel()
+        self.layout().addWidget(self.progress_panel)
+
         self.result_log = QTextEdit()
         self.result_log.setReadOnly(True)
         self.layout().addWidget(self.result_log)
@@ -64,16 +82,61 @@ class MailGenerationScreen(QWidget):
     def check_ready(self):
         self.btn_generate.setEnabled(
             bool(self.excel_path and self.template_path and self.output_dir)
+            and not self.progress_panel.busy
         )
 
     def generate_letters(self):
-        try:
-            msg = generate_letters_from_excel(
-                self.excel_path,
-                self.template_path,
-                self.output_dir
-            )
+        # docxtpl/pandas hanya di-import saat benar-benar dipakai (startup lebih cepat)
+        from core.mailer import generate_letters_from_excel, generate_letters_parallel, generate_merged_letters
+        excel_path, template_path, output_dir = self.excel_path, self.template_path, self.output_dir
+        if self.merge_checkbox.isChecked():
+            letters_per_file = self.letters_per_file.value() or None
+            job = Job(lambda context: generate_merged_letters(
+                excel_path, template_path, output_dir,
+                letters_per_file=letters_per_file, on_progress=context.report
+            ))
+            # Dokumen gabungan yang sedang disusun hanya ada di memori
+            if letters_per_file:
+                cancelled_msg = ("⚠️ Dibatalkan. Dokumen gabungan yang sudah penuh tetap tersimpan; "
+                                 "dokumen yang sedang disusun tidak disimpan.")
+            else:
+                cancelled_msg = "⚠️ Dibatalkan. Dokumen gabungan tidak disimpan."
+        else:
+            if self.parallel_checkbox.isChecked():
+                job = Job(lambda context: generate_letters_parallel(
+                    excel_path, template_path, output_dir, on_progress=context.report
+                ))
+            else:
+                job = Job(lambda context: generate_letters_from_excel(
+                    excel_path, template_path, output_dir, on_progress=context.report
+                ))
+            cancelled_msg = "⚠️ Dibatalkan. Surat yang sudah jadi tetap tersimpan dan dilewati pada run berikutnya."
+
+        def finished(result):
+            self.check_ready()
+            if isinstance(result, str):
+                msg = result
+            else:
+                failed = [r for r in result if not r["success"]]
+                skipped = sum(1 for r in result if r.get("skipped"))
+                msg = f"{len(result) - len(failed) - skipped} surat berhasil dibuat di folder: {output_dir}"
+                if skipped:
+                    msg += f"\n{skipped} surat tidak berubah (dilewati)"
+                if failed:
+                    msg += f"\n{len(failed)} surat gagal:\n" + "\n".join(
+                        f"Baris {r['row']}: {r['error']}" for r in failed
+                    )
             self.result_log.setText("✅ Success:\n" + msg)
             QMessageBox.information(self, "Done", msg)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+
+        def failed(error):
+            self.check_ready()
+            QMessageBox.critical(self, "Error", error)
+
+        def cancelled():
+            self.check_ready()
+            self.result_log.setText(cancelled_msg)
+
+        self.result_log.setText("⏳ Generating letters...")
+        self.progress_panel.run(job, finished, failed, cancelled)
+        self.check_ready()
@@ -1,12 +1,13 @@
 from PySide6.QtWidgets import (
     QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QComboBox,
-    QMessageBox, QHBoxLayout, QToolButton, QFormLayout, QSpacerItem, QSizePolicy, QGroupBox
+    QMessageBox, QHBoxLayout, QToolButton, QFormLayout, QSpacerItem, QSizePolicy, QGroupBox, QSpinBox
 )
 from PySide6.QtGui import QIcon
 from PySide6.QtCore import Signal
-from core.scraper import Scraper
 from core import presets
+from gui.jobs import Job, JobProgressPanel
 import threading
+import os
 
 class ScrapingScreen(QWidget):
     enquiry_opened = Signal(str)
@@ -15,7 +16,8 @@ class ScrapingScreen(QWidget):
     def __init__(self, driver_path):
         super().__init__()
         self.driver_path = driver_path
-        self.scraper = Scraper(driver_path)
+        self.scraper = None  # created on first use; importing selenium is slow
+        self.driver_pool = None  # warm Edge sessions reused by test/batch runs
         self.init_ui()
 
     def init_ui(self):
@@ -42,6 +44,14 @@ class ScrapingScreen(QWidget):
         file_layout.addWidget(self.file_path_entry)
         file_layout.addWidget(self.browse_button)
         form_layout.addRow("Input File:", file_layout)
+
+        # Warm Edge sessions kept by the driver pool (Test Workflow and Run Batch can run side by side)
+        self.pool_size_spin = QSpinBox()
+        self.pool_size_spin.setRange(1, 8)
+        self.pool_size_spin.setValue(2)
+        self.pool_size_spin.setToolTip("Number of browser sessions kept open and reused between runs")
+        self.pool_size_spin.valueChanged.connect(self.set_pool_size)
+        form_layout.addRow("Browser Sessions:", self.pool_size_spin)
         
         # === ACTION BUTTONS ===
         button_layout = QHBoxLayout()
@@ -60,6 +70,12 @@ class ScrapingScreen(QWidget):
         button_layout.addWidget(self.test_button)
         self.test_button.clicked.connect(self.test_workflow)
 
+        # Batch button: run the team's workflow for every row of the Input File
+        self.batch_button = QPushButton("Run Batch")
+        self.batch_button.setToolTip("Run the selected team's workflow for every row of the Input File")
+        button_layout.addWidget(self.batch_button)
+        self.batch_button.clicked.connect(self.run_batch)
+
 
         # GroupBox for visual grouping (optional but helps with modularity)
         input_group = QGroupBox("Scraping Configuration")  # <-- Interchangeable: Rename for other screens
@@ -69,6 +85,8 @@ class ScrapingScreen(QWidget):
         main_layout = QVBoxLayout()
         main_layout.addWidget(input_group)
         main_layout.addLayout(button_layout)
+        self.progress_panel = JobProgressPanel()
+        main_layout.addWidget(self.progress_panel)
         main_layout.addSpacerItem(QSpacerItem(20, 20, QSizePolicy.Minimum, QSizePolicy.Expanding))  # Pushes UI up
         self.setLayout(main_layout)
 
@@ -100,21 +118,23 @@ class ScrapingScreen(QWidget):
             "Please log in to your web app and open the Enquiry page.\n\nClick 'Resume' once the Enquiry window is fully opened."
         )
 
-        threading.Thread(target=self.scraper.start_browser, args=(url,), daemon=True).start()
+        threading.Thread(target=self.get_scraper().start_browser, args=(url,), daemon=True).start()
 
     def resume_scraping(self):
         self.resume_button.setEnabled(False)
         self.selected_team = self.team_combo.currentText()
         self.fields = presets.get_fields_for_team(self.selected_team)
 
+        scraper = self.get_scraper()
+
         def scrape_thread():
-            title = self.scraper.wait_for_new_window()
+            title = scraper.wait_for_new_window()
             if title:
                 self.enquiry_opened.emit(title)
-                self.scraper.scrape_data(self.fields)
+                scraper.scrape_data(self.fields)
             else:
                 self.enquiry_failed.emit()
-            self.scraper.close_browser()
+            scraper.close_browser()
             self.reset_app()
 
         threading.Thread(target=scrape_thread, daemon=True).start()
@@ -145,22 +165,22 @@ class ScrapingScreen(QWidget):
 
         def test_thread():
             print("Starting test thread...")
-            self.test_button.setEnabled(False)
-            print("Starting browser...")
-            self.scraper.start_browser(url)
-            self.scraper.driver.implicitly_wait(2)
-
+            print("Leasing browser session...")
             from core.automation_runner import run_workflow
             try:
-                results = run_workflow(
-                    driver=self.scraper.driver,
-                    workflow=steps,
-                    context={},
-                    presets=preset_data,  # ✅ PASS THE LOADED PRESETS HERE
-                    team=team,
-                    screen=screen,
-                    tab=tab
-                )
+                with self.get_driver_pool().lease() as session:
+                    session.driver.get(url)
+                    session.driver.implicitly_wait(2)
+                    results = run_workflow(
+                        driver=session.driver,
+                        workflow=steps,
+                        context={},
+                        presets=preset_data,  # ✅ PASS THE LOADED PRESETS HERE
+                        team=team,
+                        screen=screen,
+                        tab=tab,
+                        index=presets.get_selector_index()
+                    )
                 print("Workflow run completed, processing results...")
                 result_msg = "\n".join(f"{k}: {v}" for k, v in results.items())
             except Exception as e:
@@ -172,19 +192,102 @@ class ScrapingScreen(QWidget):
                 QMessageBox.information(self, "Test Results", result_msg)
                 self.test_button.setEnabled(True)
 
-            print("Quitting browser...")
-            self.scraper.driver.quit()
-            self.scraper.driver = None
-            self.scraper = Scraper(self.driver_path)
-
             self.call_in_main(show_results)
 
+        self.test_button.setEnabled(False)
         threading.Thread(target=test_thread, daemon=True).start()
 
 
 
 
 
+    def run_batch(self):
+        url = self.url_entry.text().strip()
+        input_path = self.file_path_entry.text().strip()
+        if not url:
+            QMessageBox.critical(self, "Input Error", "Please enter a valid URL.")
+            return
+        if not input_path:
+            QMessageBox.critical(self, "Input Error", "Please select an Input File.")
+            return
+        if not url.startswith("http://") and not url.startswith("https://"):
+            url = "https://" + url
+
+        team = self.team_combo.currentText()
+        workflows = presets.get_workflows_for_team(team)
+        if not workflows:
+            QMessageBox.warning(self, "No Workflow", f"No workflow defined for team '{team}'.")
+            return
+        wf = workflows[0]
+        preset_data = presets.load_presets()
+        output_path = os.path.splitext(input_path)[0] + "_result.xlsx"
+        pool = self.get_driver_pool()
+
+        def work(context):
+            from core.batch_runner import count_input_rows, run_batch
+            total = count_input_rows(input_path)
+            context.report(0, total)
+            return run_batch(
+                driver=None,
+                workflow=wf["steps"],
+                input_path=input_path,
+                presets=preset_data,
+                team=wf["team"],
+                screen=wf["screen"],
+                tab=wf["tab"],
+                output_path=output_path,
+                # Progress, and the cancellation point between rows
+                on_row_done=lambda row_number, record: context.report(row_number, total),
+                pool=pool,
+                start_url=url
+            )
+
+        def finished(result_df):
+            self.batch_button.setEnabled(True)
+            statuses = result_df["SCRAPINGSTATUS"].value_counts() if len(result_df) else {}
+            failed, partial = int(statuses.get("FAILED", 0)), int(statuses.get("PARTIAL", 0))
+            QMessageBox.information(
+                self, "Batch Results",
+                f"{len(result_df)} rows processed ({failed} failed, {partial} with missing fields)."
+                f"\nResult saved to:\n{output_path}"
+            )
+
+        def failed(error):
+            self.batch_button.setEnabled(True)
+            QMessageBox.critical(self, "Batch Error", f"Error: {error}")
+
+        def cancelled():
+            self.batch_button.setEnabled(True)
+            QMessageBox.information(self, "Batch Cancelled", "Batch cancelled. The previous result file was left unchanged.")
+
+        self.batch_button.setEnabled(False)
+        self.progress_panel.run(Job(work), finished, failed, cancelled)
+
+    def get_scraper(self):
+        if self.scraper is None:
+            from core.scraper import Scraper
+            self.scraper = Scraper(self.driver_path)
+        return self.scraper
+
+    def get_driver_pool(self):
+        if self.driver_pool is None:
+            from core.driver_pool import DriverPool
+            self.driver_pool = DriverPool(self.driver_path, size=self.pool_size_spin.value())
+            # Pre-launch the sessions in the background; acquire() takes the first one as soon as it is up
+            threading.Thread(target=self._start_pool, args=(self.driver_pool,), daemon=True).start()
+        return self.driver_pool
+
+    def _start_pool(self, pool):
+        try:
+            pool.start()
+        except Exception as e:  # e.g. closed by Reset; a lease will report launch errors
+            print(f"Driver pool: pre-launch stopped: {e}")
+
+    def set_pool_size(self, size):
+        # Growing takes effect on the next lease; when shrinking, extra sessions are closed as they are returned
+        if self.driver_pool:
+            self.driver_pool.size = size
+
     def call_in_main(self, func):
         # Utility to call a UI function from thread
         from PySide6.QtCore import QTimer
@@ -197,8 +300,12 @@ class ScrapingScreen(QWidget):
         self.start_button.setEnabled(True)
         self.resume_button.setEnabled(False)
 
-        if self.scraper.driver:
+        if self.scraper and self.scraper.driver:
             self.scraper.close_browser()
-        self.scraper = Scraper(self.driver_path)
+        self.scraper = None
+
+        if self.driver_pool:
+            self.driver_pool.close()
+            self.driver_pool = None
 
         print("Application has been reset.")
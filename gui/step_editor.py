@@ -3,7 +3,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 from core.workflow import WorkflowStep
-from core.presets import load_presets  # assumes this returns a dict
+from core.presets import load_presets, get_selector_index
+from core.selector_index import make_key
 
 class StepEditorDialog(QDialog):
     def __init__(self, parent=None, step: WorkflowStep = None):
@@ -100,7 +101,7 @@ class StepEditorDialog(QDialog):
         screen = self.screen_combo.currentText()
         tab = self.tab_combo.currentText()
         field = self.field_combo.currentText()
-        selector_key = f"{team}/{screen}/{tab}/{field}"
+        selector_key = make_key(team, screen, tab, field)
         params = {}
 
         if action == "input":
@@ -112,7 +113,12 @@ class StepEditorDialog(QDialog):
 
     def load_step(self, step: WorkflowStep):
         self.action_combo.setCurrentText(step.action)
-        parts = step.selector_key.split("/")
+        # Tab/field names may contain "/", so resolve the key through the index
+        record = get_selector_index().get(step.selector_key)
+        if record:
+            parts = [record.team, record.screen, record.tab, record.field]
+        else:
+            parts = step.selector_key.split("/")
         if len(parts) == 4:
             team, screen, tab, field = parts
             self.team_combo.setCurrentText(team)
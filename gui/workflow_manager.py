@@ -1,5 +1,6 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QPushButton, QHBoxLayout, QMessageBox, QDialog
 from core.workflow import Workflow, WorkflowStep
+from core.presets import get_selector_index, load_workflows_for_edit, save_workflow
 from gui.step_editor import StepEditorDialog
 
 class WorkflowManager(QWidget):
@@ -44,8 +45,16 @@ class WorkflowManager(QWidget):
         self.load_workflow()
     
     def load_workflow(self):
+        # workflow.json (or the preset database) also holds the scraping
+        # workflows, which have a team; the manager edits the first one without
         try:
-            self.workflow = Workflow.load_from_file("workflow.json")
+            workflows = load_workflows_for_edit()
+        except FileNotFoundError:
+            return
+        try:
+            entry = next((wf for wf in workflows if isinstance(wf, dict) and "team" not in wf), None)
+            if entry is not None:
+                self.workflow = Workflow.from_dict(entry)
             self._refresh_step_list()
         except Exception as e:
             QMessageBox.warning(self, "Load Error", f"Could not load workflow: {e}")
@@ -97,5 +106,22 @@ class WorkflowManager(QWidget):
             self.step_list.addItem(f"{i+1}. {step.action} → {step.selector_key}")
 
     def save_workflow(self):
-        self.workflow.save_to_file("workflow.json")
+        # Surface invalid steps now rather than when a run reaches them
+        from core.workflow_compiler import compile_workflow, WorkflowCompileError  # imports selenium
+        try:
+            compile_workflow(self.workflow, get_selector_index())
+            problem = None
+        except WorkflowCompileError as e:
+            problem = str(e)
+        except Exception as e:
+            problem = f"Could not validate the workflow: {e}"
+        if problem:
+            answer = QMessageBox.question(
+                self, "Invalid Steps", f"{problem}\n\nSave the workflow anyway?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No,
+            )
+            if answer != QMessageBox.Yes:
+                return
+        # Through core.presets so it reaches the same store (file or database) runs read from
+        save_workflow(self.workflow.to_dict())
         QMessageBox.information(self, "Saved", "Workflow saved successfully!")
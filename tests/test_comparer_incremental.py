@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from core.comparer import compare_frames_incremental
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=["A", "B"], dtype=str)
+
+
+def test_incremental_manifest_reuses_unchanged_rows(tmp_path):
+    manifest_path = str(tmp_path / "target.xlsx.compare-manifest.npz")
+    reference = _frame([["1", "a"], ["2", "b"], ["3", "c"]])
+
+    first = compare_frames_incremental(reference, _frame([["1", "a"], ["2", "x"], ["3", "c"]]),
+                                       ["A", "B"], manifest_path, reference_key="ref|1")
+    second = compare_frames_incremental(reference, _frame([["1", "a"], ["2", "x"], ["3", "z"]]),
+                                        ["A", "B"], manifest_path, reference_key="ref|1")
+
+    assert first[0] == ["MATCH", "MISMATCH", "MATCH"]
+    assert second[0] == ["MATCH", "MISMATCH", "MISMATCH"]
+    assert second[1][:2] == first[1][:2]
+    assert second[2] == 2
+    assert second[3]["B"].tolist() == [False, True, True]
+    # Plain arrays only: the manifest loads without unpickling anything
+    with np.load(manifest_path, allow_pickle=False) as data:
+        assert data["status"].tolist() == second[0]
+
+
+def test_incremental_ignores_unreadable_manifest(tmp_path):
+    manifest_path = tmp_path / "target.xlsx.compare-manifest.npz"
+    manifest_path.write_bytes(b"not a manifest")
+    reference = _frame([["1", "a"], ["2", "b"]])
+
+    status, _, reused, _ = compare_frames_incremental(reference, _frame([["1", "a"], ["2", "b"]]),
+                                                      ["A", "B"], str(manifest_path))
+
+    assert status == ["MATCH", "MATCH"]
+    assert reused == 0
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from core.comparer import compare_excel_files_streaming
+
+
+def _write_csv(path, rows):
+    pd.DataFrame(rows, columns=["A", "B"]).to_csv(path, index=False)
+
+
+def test_streaming_keeps_target_rows_when_target_is_shorter(tmp_path):
+    reference = tmp_path / "reference.csv"
+    target = tmp_path / "target.csv"
+    _write_csv(reference, [["1", "a"], ["2", "b"], ["3", "c"], ["4", "d"]])
+    _write_csv(target, [["1", "a"], ["2", "b"], ["3", "c"]])
+
+    output_path, _ = compare_excel_files_streaming(str(reference), str(target), chunk_size=2, rules={})
+
+    result = pd.read_csv(output_path, dtype=str)
+    assert result["A"].tolist()[:3] == ["1", "2", "3"]
+    assert result["B"].tolist()[:3] == ["a", "b", "c"]
+    assert result["STATUS"].tolist() == ["MATCH", "MATCH", "MATCH", "MISMATCH"]
+    assert result["STATUSMSG"].tolist()[3] == "Row missing in scraped file"
+
+
+def test_streaming_reports_extra_target_rows(tmp_path):
+    reference = tmp_path / "reference.csv"
+    target = tmp_path / "target.csv"
+    _write_csv(reference, [["1", "a"], ["2", "b"], ["3", "c"]])
+    _write_csv(target, [["1", "a"], ["2", "b"], ["3", "x"], ["4", "d"]])
+
+    output_path, _ = compare_excel_files_streaming(str(reference), str(target), chunk_size=2, rules={})
+
+    result = pd.read_csv(output_path, dtype=str)
+    assert result["A"].tolist() == ["1", "2", "3", "4"]
+    assert result["STATUS"].tolist() == ["MATCH", "MATCH", "MISMATCH", "MISMATCH"]
+    assert result["STATUSMSG"].tolist()[3] == "Row not found in reference file"
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from core import driver_pool
+from core.driver_pool import DriverPool
+
+
+class FakeDriver:
+    launched = 0
+
+    def __init__(self, service=None):
+        time.sleep(0.05)
+        FakeDriver.launched += 1
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture(autouse=True)
+def fake_edge(monkeypatch):
+    FakeDriver.launched = 0
+    monkeypatch.setattr(driver_pool.webdriver, "Edge", FakeDriver)
+    monkeypatch.setattr(driver_pool, "Service", lambda path: None)
+
+
+def test_waiter_gets_a_session_after_a_recycle_frees_the_slot():
+    pool = DriverPool("msedgedriver.exe", size=1, max_rows=1)
+    first = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.1)  # the waiter is now blocked: the only slot is leased
+
+    pool.release(first, rows=1)  # worn out: discarded, not returned to the idle queue
+    waiter.join(5)
+
+    assert not waiter.is_alive()
+    assert got and got[0] is not first
+    assert first.driver.quit_called
+    assert FakeDriver.launched == 2
+
+
+def test_two_threads_never_exceed_the_pool_size():
+    pool = DriverPool("msedgedriver.exe", size=1, max_rows=2)
+    in_use = []
+    peak = []
+
+    def worker():
+        for _ in range(3):
+            with pool.lease(timeout=5) as session:
+                in_use.append(session)
+                peak.append(len(in_use))
+                time.sleep(0.01)
+                in_use.remove(session)
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+
+    assert max(peak) == 1
+    assert FakeDriver.launched == 3  # 6 rows, recycled every 2
+
+
+def test_close_wakes_waiters():
+    pool = DriverPool("msedgedriver.exe", size=1)
+    pool.acquire()
+    errors = []
+
+    def wait():
+        try:
+            pool.acquire()
+        except RuntimeError as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.1)
+    pool.close()
+    waiter.join(5)
+
+    assert not waiter.is_alive()
+    assert len(errors) == 1
+
+
+def test_acquire_times_out_when_the_pool_is_busy():
+    pool = DriverPool("msedgedriver.exe", size=1)
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.1)
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from core import presets
+from core.workflow import Workflow, WorkflowStep
+
+PRESETS = {
+    "EUC": {
+        "Relationship Individual": {
+            "Tab 1": {
+                "name": {"type": "css", "selector": "#name"},
+                "account_number": {"type": "css", "selector": "#account"},
+            }
+        }
+    }
+}
+
+
+@pytest.fixture
+def preset_files(tmp_path, monkeypatch):
+    presets_path = tmp_path / "presets.json"
+    presets_path.write_text(json.dumps(PRESETS), encoding="utf-8")
+    monkeypatch.setattr(presets, "PRESET_FILE", str(presets_path))
+    monkeypatch.setattr(presets, "WORKFLOW_PATH", str(tmp_path / "workflow.json"))
+    presets.clear_cache()
+    yield tmp_path
+    presets.clear_cache()
+
+
+def test_selector_index_accepts_workflow_saved_by_workflow_manager(preset_files):
+    workflow = Workflow(name="Manager Workflow", steps=[
+        WorkflowStep("extract", "EUC/Relationship Individual/Tab 1/name", {"as": "Name"}),
+        WorkflowStep("click", "EUC/Relationship Individual/Tab 1/missing"),
+    ])
+    workflow.save_to_file(presets.WORKFLOW_PATH)
+
+    index = presets.get_selector_index()
+
+    assert "EUC/Relationship Individual/Tab 1/name" in index
+    assert index.problems == ["Manager Workflow: dangling selector EUC/Relationship Individual/Tab 1/missing"]
+    assert presets.get_workflow("EUC", "Relationship Individual", "Tab 1") == []
+
+
+def test_selector_index_reports_non_object_workflow_entries(preset_files):
+    entries = [
+        "not a workflow",
+        {"name": "Workflow 1", "team": "EUC", "screen": "Relationship Individual", "tab": "Tab 1",
+         "steps": [{"action": "extract", "field": "account_number", "as": "Account"}, {"action": "wait"}]},
+    ]
+    with open(presets.WORKFLOW_PATH, "w", encoding="utf-8") as f:
+        json.dump(entries, f)
+
+    index = presets.get_selector_index()
+
+    assert index.problems == ["workflow entry 1 is not a workflow object, skipped"]
+    assert [step["field"] for step in presets.get_workflow("EUC", "Relationship Individual", "Tab 1")
+            if "field" in step] == ["account_number"]